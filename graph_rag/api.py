@@ -210,6 +210,15 @@ async def delete_graph(kg_id: str):
     return {"status": "deleted", "kg_id": kg_id}
 
 
+@app.post("/graphs/{kg_id}/invalidate")
+async def invalidate_graph(kg_id: str):
+    """Drop cached lookups/traversals for a KG after its data changed."""
+    if registry.get(kg_id) is None:
+        raise HTTPException(status_code=404, detail=f"KG '{kg_id}' not found")
+    registry.invalidate(kg_id)
+    return {"status": "invalidated", "kg_id": kg_id}
+
+
 # ── Query Endpoints ───────────────────────────────────────────────────
 
 @app.post("/query", response_model=QueryResponse)
@@ -1,14 +1,64 @@
 import os
+import sys
+import copy
 import json
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is the fallback parser
+    orjson = None
+
 load_dotenv()
 
 NEO4J_URI = os.getenv("NEO4J_URI")
 NEO4J_USER = os.getenv("NEO4J_USERNAME")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
 NEO4J_DATABASE = os.getenv("NEO4J_DATABASE", "neo4j")
+NEO4J_POOL_SIZE = int(os.getenv("NEO4J_POOL_SIZE", "50"))
+NEO4J_ACQUISITION_TIMEOUT = float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", "60"))
+NEO4J_MAX_CONNECTION_LIFETIME = float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600"))
+
+def _intern_strings(value):
+    """Recursively intern every string key and value of a parsed JSON tree."""
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, dict):
+        return {sys.intern(k): _intern_strings(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_intern_strings(v) for v in value]
+    return value
+
+
+@lru_cache(maxsize=8)
+def _read_json(path: str) -> dict:
+    """
+    Parse a JSON file once per path (orjson when installed).
+
+    Strings are interned, so the label / relationship names repeated across
+    intent patterns share one object and compare by identity first.
+    """
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return _intern_strings(orjson.loads(f.read()))
+    with open(path, "r") as f:
+        return _intern_strings(json.load(f))
+
+
+def load_config(config_path_or_dict) -> dict:
+    """
+    Accept a file path or a config dict directly.
+
+    Files are parsed once per process; every caller gets its own deep copy
+    of that parse, so a consumer that mutates its config cannot leak the
+    change into later IntentClassifier / ContextGenerator / engine instances.
+    """
+    if isinstance(config_path_or_dict, dict):
+        return config_path_or_dict
+    return copy.deepcopy(_read_json(os.path.abspath(os.fspath(config_path_or_dict))))
+
 
 def load_domain_config(domain: str) -> dict:
     """Load domain-specific JSON config from the config/ directory."""
@@ -16,5 +66,4 @@ def load_domain_config(domain: str) -> dict:
     if not config_path.exists():
         raise FileNotFoundError(f"Config for domain '{domain}' not found at {config_path}")
     
-    with open(config_path, "r") as f:
-        return json.load(f)
\ No newline at end of file
+    return load_config(config_path)
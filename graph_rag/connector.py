@@ -9,11 +9,61 @@ Supports two modes:
   1. Default: reads credentials from .env (NEO4J_URI, etc.)
   2. Dynamic: accepts uri/user/password/database at construction time
      for multi-KG scenarios where each graph has its own credentials.
+
+Drivers own the Bolt connection pool and are expensive to create, so they
+are shared process-wide: every connector built with the same credentials
+reuses one driver. One-shot queries go through ``driver.execute_query``
+(a managed, retried transaction on a pooled connection, no session
+bookkeeping); sessions are only opened for streaming and batched writes.
 """
-from neo4j import GraphDatabase
+import threading
+from contextlib import contextmanager
+
+from neo4j import GraphDatabase, READ_ACCESS, WRITE_ACCESS, Result, RoutingControl
 from neo4j.exceptions import ClientError
 
-from .config import NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD, NEO4J_DATABASE
+from .config import (
+    NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD, NEO4J_DATABASE,
+    NEO4J_POOL_SIZE, NEO4J_ACQUISITION_TIMEOUT, NEO4J_MAX_CONNECTION_LIFETIME,
+)
+
+# ---------------------------------------------------------------------------
+# Process-wide driver cache: (uri, user, password) -> [driver, refcount]
+# ---------------------------------------------------------------------------
+_drivers: dict[tuple, list] = {}
+_drivers_lock = threading.Lock()
+
+
+def _acquire_driver(uri: str, user: str, password: str):
+    """Return the shared driver for these credentials, creating it lazily."""
+    key = (uri, user, password)
+    with _drivers_lock:
+        entry = _drivers.get(key)
+        if entry is None:
+            driver = GraphDatabase.driver(
+                uri,
+                auth=(user, password),
+                max_connection_pool_size=NEO4J_POOL_SIZE,
+                connection_acquisition_timeout=NEO4J_ACQUISITION_TIMEOUT,
+                # Keep pooled (TLS-authenticated) connections alive across runs
+                max_connection_lifetime=NEO4J_MAX_CONNECTION_LIFETIME,
+            )
+            entry = _drivers[key] = [driver, 0]
+        entry[1] += 1
+        return entry[0]
+
+
+def _release_driver(uri: str, user: str, password: str) -> None:
+    """Drop one reference; the driver is closed when nobody uses it."""
+    key = (uri, user, password)
+    with _drivers_lock:
+        entry = _drivers.get(key)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] <= 0:
+            del _drivers[key]
+            entry[0].close()
 
 
 class GraphDBConnector:
@@ -44,10 +94,10 @@ class GraphDBConnector:
         self._password = password or NEO4J_PASSWORD
         self._database = database or NEO4J_DATABASE
 
-        self.driver = GraphDatabase.driver(
-            self._uri,
-            auth=(self._user, self._password),
-        )
+        self.driver = _acquire_driver(self._uri, self._user, self._password)
+        self._closed = False
+        # Explicit transaction bound to the current thread by transaction()
+        self._bound = threading.local()
 
     def check_connection(self) -> tuple[bool, str]:
         """
@@ -66,10 +116,150 @@ class GraphDBConnector:
             return False, f"Connection failed: {error}"
 
     def close(self):
-        self.driver.close()
+        """Release this connector's reference to the shared driver."""
+        if not self._closed:
+            self._closed = True
+            _release_driver(self._uri, self._user, self._password)
+
+    @contextmanager
+    def session(self, access_mode: str = "WRITE"):
+        """
+        A driver session for running many statements back to back on one
+        pooled connection. access_mode="READ" lets clusters (e.g. Aura) route
+        the work to a reader. Sessions are not thread-safe: one per thread.
+        """
+        mode = READ_ACCESS if access_mode.upper() == "READ" else WRITE_ACCESS
+        with self.driver.session(database=self._database, default_access_mode=mode) as session:
+            yield session
+
+    @contextmanager
+    def transaction(self, access_mode: str = "READ"):
+        """
+        Run every execute_query / stream_query call made by this thread
+        inside the block in ONE explicit transaction, instead of one
+        transaction per call. Other threads are unaffected.
+
+        The transaction commits when the block exits cleanly. If a query in
+        it fails (e.g. a probe for an optional procedure), the transaction
+        is rolled back and later calls in the block fall back to running
+        on their own, so callers that catch query errors keep working.
+
+        The transaction and its pooled connection stay open until the block
+        exits, so put only Cypher calls inside it. LLM calls and other slow
+        work belong before or after the block; otherwise they pin a
+        connection and hold server-side transaction state for their whole
+        duration.
+        """
+        previous = getattr(self._bound, "tx", None)
+        with self.session(access_mode) as session:
+            tx = session.begin_transaction()
+            self._bound.tx = tx
+            try:
+                yield tx
+            except BaseException:
+                tx.close()
+                raise
+            else:
+                if self._bound.tx is tx:
+                    tx.commit()
+                else:
+                    tx.close()
+            finally:
+                self._bound.tx = previous
+
+    def _bound_records(self, query, params):
+        """Records from the thread's bound transaction; unbinds it on failure."""
+        try:
+            yield from self._bound.tx.run(query, params)
+        except Exception:
+            self._bound.tx = None
+            raise
 
     def execute_query(self, query, params=None):
-        """Execute a Cypher query using a short-lived session (best practice)."""
+        """
+        Execute a read-only Cypher query and return its records as dicts.
+
+        Runs through ``driver.execute_query``: one managed read transaction
+        on a pooled connection, routed to a reader (on clusters such as Aura
+        this keeps lookups off the leader) and retried on transient errors.
+        Inside transaction() it runs in the bound transaction instead.
+        Writes and schema changes go through execute_write().
+        """
+        if getattr(self._bound, "tx", None) is not None:
+            return [record.data() for record in self._bound_records(query, params)]
+        return self.execute_read(query, params)
+
+    def execute_read(self, query, params=None):
+        """Like execute_query, but never joins a transaction bound by transaction()."""
+        return self.driver.execute_query(
+            query, params,
+            database_=self._database,
+            routing_=RoutingControl.READ,
+            result_transformer_=Result.data,
+        )
+
+    def ensure_fulltext_index(self, name: str, labels: list[str], props: list[str]) -> None:
+        """
+        Idempotently create a full-text (Lucene) index over ``props`` of
+        every label in ``labels``. Used for fuzzy candidate lookup via
+        ``db.index.fulltext.queryNodes``.
+        """
+        label_expr = "|".join(f"`{label}`" for label in labels)
+        prop_expr = ", ".join(f"n.`{prop}`" for prop in props)
+        self.execute_write([(
+            f"CREATE FULLTEXT INDEX `{name}` IF NOT EXISTS "
+            f"FOR (n:{label_expr}) ON EACH [{prop_expr}]",
+            None,
+        )])
+
+    def stream_query(self, query, params=None):
+        """
+        Execute a Cypher query and yield each record as a dict as it arrives.
+
+        Unlike execute_query, the result set is never materialised, so callers
+        can score-and-discard rows while the rest are still on the wire. The
+        session stays open until the generator is exhausted or closed.
+        Read-only: the session is routed to a reader.
+        """
+        if getattr(self._bound, "tx", None) is not None:
+            for record in self._bound_records(query, params):
+                yield record.data()
+            return
+        with self.session("READ") as session:
+            for record in session.run(query, params):
+                yield record.data()
+
+    def execute_write(self, statements: list[tuple[str, dict | None]]) -> None:
+        """
+        Run several write statements in ONE explicit write transaction.
+
+        Everything commits (and fsyncs) once, and the driver retries the
+        whole unit on transient errors. Schema changes (CREATE INDEX, ...)
+        cannot share a transaction with data writes; run those separately.
+        """
+        def _work(tx):
+            for query, params in statements:
+                tx.run(query, params or {}).consume()
+
         with self.driver.session(database=self._database) as session:
-            result = session.run(query, params)
-            return result.data()
+            session.execute_write(_work)
+
+    def bulk_write(self, cypher: str, rows: list[dict], batch_size: int | None = None) -> None:
+        """
+        Apply ``cypher`` to every row of ``rows`` (bound as ``row``).
+
+        Without batch_size all rows go through a single UNWIND in one explicit
+        transaction. With batch_size the server splits the work into
+        ``CALL { ... } IN TRANSACTIONS OF <batch_size> ROWS`` commits, which
+        bounds transaction memory for large imports (auto-commit only).
+        """
+        if batch_size is None:
+            self.execute_write([(f"UNWIND $rows AS row {cypher}", {"rows": rows})])
+            return
+        # CALL ... IN TRANSACTIONS must run as an auto-commit query
+        with self.session() as session:
+            session.run(
+                f"UNWIND $rows AS row CALL {{ WITH row {cypher} }} "
+                f"IN TRANSACTIONS OF {int(batch_size)} ROWS",
+                {"rows": rows},
+            ).consume()
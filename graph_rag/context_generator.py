@@ -20,21 +20,44 @@ RELATIONSHIPS:
   - Aspirin may cause Nausea
 """
 
-import json
+import io
 import logging
-from typing import Optional
+import string
+from functools import lru_cache
+from typing import Callable, Optional
+from .config import load_config
 from .llm_interface import LLMInterface
 
 logger = logging.getLogger(__name__)
 
 _DEFAULT_REL_TEMPLATE = "{source} --{type}--> {target}"
 
+_TEMPLATE_SLOTS = {"source": 0, "target": 1, "type": 2}
 
-def _load_config(config_path_or_dict) -> dict:
-    if isinstance(config_path_or_dict, dict):
-        return config_path_or_dict
-    with open(config_path_or_dict) as f:
-        return json.load(f)
+
+@lru_cache(maxsize=256)
+def _compile_template(template: str) -> Callable[[str, str, str], str]:
+    """
+    Parse a relationship template once into a (source, target, type) -> str
+    closure, so formatting an edge is a join rather than a str.format parse.
+    Templates with fields/format specs we don't specialise keep str.format.
+    """
+    pieces: list[tuple[str, int | None]] = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        if field is not None and (field not in _TEMPLATE_SLOTS or spec or conversion):
+            return lambda source, target, rel_type: template.format(
+                source=source, target=target, type=rel_type
+            )
+        pieces.append((literal, _TEMPLATE_SLOTS[field] if field is not None else None))
+
+    def _format(source: str, target: str, rel_type: str) -> str:
+        values = (source, target, rel_type)
+        return "".join([
+            literal + (str(values[slot]) if slot is not None else "")
+            for literal, slot in pieces
+        ])
+
+    return _format
 
 
 class ContextGenerator:
@@ -44,9 +67,13 @@ class ContextGenerator:
     """
 
     def __init__(self, config: str | dict, llm: Optional[LLMInterface] = None):
-        loaded = _load_config(config)
+        loaded = load_config(config)
         self.llm = llm
         self._rel_templates: dict[str, str] = loaded.get("relationship_templates", {})
+        self._rel_formatters: dict[str, Callable[[str, str, str], str]] = {
+            rel_type: _compile_template(tmpl) for rel_type, tmpl in self._rel_templates.items()
+        }
+        self._default_formatter = _compile_template(_DEFAULT_REL_TEMPLATE)
 
     def generate(self, subgraph: dict) -> str:
         """
@@ -63,11 +90,16 @@ class ContextGenerator:
         if not nodes:
             return ""  # Domain guard handles the "out of scope" messaging
 
-        id_to_name = {n["id"]: n["name"] or n["label"] for n in nodes}
-        lines = ["ENTITIES:"]
+        # Display names packed once into a list; edges resolve ids to list slots.
+        id_to_idx = {n["id"]: i for i, n in enumerate(nodes)}
+        names = [n["name"] or n["label"] for n in nodes]
+        # Single C-level buffer; each entry is written with its leading newline
+        # so no intermediate list is built and no trailing newline is left.
+        buf = io.StringIO()
+        w = buf.write
+        w("ENTITIES:")
         for node in nodes:
-            label, name = node["label"], node["name"] or "(unnamed)"
-            lines.append(f"  - [{label}] {name}")
+            w(f"\n  - [{node['label']}] {node['name'] or '(unnamed)'}")
 
         if relationships:
             # Deduplicate: same source→target→type = one fact
@@ -83,12 +115,18 @@ class ContextGenerator:
             if len(unique_rels) > 20:
                 unique_rels = unique_rels[:20]
 
-            lines.append("\nRELATIONSHIPS:")
+            w("\n\nRELATIONSHIPS:")
+            # Loop-invariant lookups hoisted into locals
+            idx_of = id_to_idx.get
+            formatter_for = self._rel_formatters.get
+            default_fmt = self._default_formatter
             for rel in unique_rels:
-                src = id_to_name.get(rel["source_id"], "Unknown")
-                tgt = id_to_name.get(rel["target_id"], "Unknown")
-                tmpl = self._rel_templates.get(rel["type"], _DEFAULT_REL_TEMPLATE)
-                lines.append(f"  - {tmpl.format(source=src, target=tgt, type=rel['type'])}")
-
-        return "\n".join(lines)
+                si = idx_of(rel["source_id"])
+                ti = idx_of(rel["target_id"])
+                src = names[si] if si is not None else "Unknown"
+                tgt = names[ti] if ti is not None else "Unknown"
+                rel_type = rel["type"]
+                w(f"\n  - {formatter_for(rel_type, default_fmt)(src, tgt, rel_type)}")
+
+        return buf.getvalue()
 
@@ -19,11 +19,17 @@ Algorithm
    Longer n-grams are tried first because multi-word entity names
    (e.g. "stomach bleeding", "blood pressure") should win over their
    component words.
-4. For each candidate, first attempt an EXACT, case-insensitive match
-   against configurable node properties (default: `name`).
-5. If exact match yields nothing, attempt a PARTIAL (CONTAINS) match.
-6. Optionally fall back to Levenshtein fuzzy matching when the
-   python-Levenshtein package is available.
+4. Send ALL candidates in ONE batched (UNWIND) query that finds both
+   EXACT and PARTIAL (CONTAINS) case-insensitive matches against
+   configurable node properties (default: `name`), tagging each row with
+   its keyword and match tier.
+5. Keep only the best tier per keyword: exact matches win over partial ones.
+   An exact hit on a multi-word candidate consumes its component words, so
+   sub-grams of that phrase are not looked up any further.
+6. For candidates still unresolved, fall back to Levenshtein fuzzy
+   matching: server-side via APOC when installed (again one UNWIND query
+   for all of them), else client-side with RapidFuzz (or
+   python-Levenshtein) when available.
 7. De-duplicate results and return.
 
 Design goals
@@ -37,8 +43,15 @@ Design goals
 from __future__ import annotations
 
 import re
+import heapq
+import string
 import logging
 import math
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from itertools import combinations
 from typing import Optional
 
@@ -71,6 +84,51 @@ _DEFAULT_STOP_WORDS: frozenset[str] = frozenset(
     }
 )
 
+# Characters stripped from queries before tokenisation (everything except
+# ASCII letters, digits, whitespace and hyphens).
+_CLEAN_RE = re.compile(r"[^a-zA-Z0-9\s\-]")
+_CLEAN_TABLE = str.maketrans({c: " " for c in string.punctuation if c != "-"})
+
+# Above this many distinct searchable values the trigram prefilter is skipped.
+_NAME_INDEX_CAP = 200_000
+
+# Seconds before the trigram prefilter is reloaded, so nodes written to the
+# graph after the first lookup become reachable again without a restart.
+_NAME_INDEX_TTL = 300.0
+
+# Full-text (Lucene) index over search_properties; its fuzzy term queries
+# (`asprin~`) supply client-side fuzzy candidates without a label scan.
+_FULLTEXT_INDEX = "entity_names"
+_LUCENE_SPECIAL_RE = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/])')
+
+# Upper bound on concurrent fallback lookups; stays well inside the driver's
+# connection pool (NEO4J_POOL_SIZE).
+_MAX_LOOKUP_WORKERS = 16
+
+# Batched exact/partial results are cached per keyword (misses included)
+# for this many seconds; cache_ttl=0 disables the cache.
+_LOOKUP_CACHE_TTL = 300.0
+_LOOKUP_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=1024)
+def _ngram_candidates(query: str, stop_words: frozenset[str]) -> tuple[str, ...]:
+    """Trigrams, then bigrams, then unigrams of query's content words."""
+    # ASCII fast path: one C-level translate pass; the regex only runs for
+    # non-ASCII input so both paths strip exactly the same characters.
+    cleaned = query.translate(_CLEAN_TABLE) if query.isascii() else _CLEAN_RE.sub(" ", query)
+    tokens = cleaned.lower().split()
+    content_tokens = [t for t in tokens if t not in stop_words]
+    if not content_tokens: content_tokens = tokens
+    # zip over offset views is a C-level sliding window; the dict acts as
+    # an insertion-ordered set, so trigrams stay ahead of bigrams/unigrams.
+    grams = {
+        " ".join(window): None
+        for n in (3, 2, 1)
+        for window in zip(*(content_tokens[i:] for i in range(n)))
+    }
+    return tuple(grams)
+
 
 class QueryTimeEntityExtractor:
     """
@@ -90,7 +148,15 @@ class QueryTimeEntityExtractor:
         Additional domain-specific words to ignore (e.g. ["drug", "disease"]).
     fuzzy_threshold:
         Levenshtein similarity threshold (0–1) for fuzzy matching.
-        Only used when python-Levenshtein is installed.
+        Used with APOC, RapidFuzz or python-Levenshtein, whichever is available.
+    return_properties:
+        Node properties returned with each match (via a Cypher map
+        projection, so heavy fields such as embeddings never leave the
+        server). Defaults to "name" plus search_properties.
+    cache_ttl:
+        Seconds a batched exact/partial lookup result (or miss) is reused
+        for the same keyword. 0 disables the cache; call clear_cache()
+        after writing to the graph.
     """
 
     def __init__(
@@ -102,22 +168,57 @@ class QueryTimeEntityExtractor:
         extra_stop_words: list[str] | None = None,
         fuzzy_threshold: float = 0.85,
         semantic_threshold: float = 0.70,
+        return_properties: list[str] | None = None,
+        cache_ttl: float = _LOOKUP_CACHE_TTL,
     ):
         self.connector = connector
         self.llm = llm  # New in V2: LLM for semantic extraction/matching
         self.search_properties = search_properties or ["name"]
         self.node_labels = node_labels
+        self.return_properties = list(
+            dict.fromkeys(return_properties or ["name", *self.search_properties])
+        )
         self.fuzzy_threshold = fuzzy_threshold
         self.semantic_threshold = semantic_threshold
         self.stop_words = _DEFAULT_STOP_WORDS | frozenset(
             w.lower() for w in (extra_stop_words or [])
         )
+        # Set by ensure_indexes(): client-side fuzzy candidates then come
+        # from the full-text index.
+        self._fulltext = False
 
+        # Client-side fuzzy backend: RapidFuzz (bit-parallel, C++) preferred,
+        # python-Levenshtein as a fallback.
         try:
-            import Levenshtein
-            self._fuzzy_available = True
+            import rapidfuzz
+            self._fuzzy_backend: str | None = "rapidfuzz"
         except ImportError:
-            self._fuzzy_available = False
+            try:
+                import Levenshtein
+                self._fuzzy_backend = "levenshtein"
+            except ImportError:
+                self._fuzzy_backend = None
+        self._fuzzy_available = self._fuzzy_backend is not None
+        # Server-side fuzzy scoring via APOC; None = not probed yet.
+        self._apoc_available: bool | None = None
+
+        # Character trigrams of every searchable value, for O(1) rejection of
+        # keywords that cannot match lexically. Loaded on the first lookup and
+        # reloaded after _NAME_INDEX_TTL; None = not loaded yet, empty set =
+        # prefilter disabled.
+        self._name_trigrams: set[str] | None = None
+        self._name_index_expires = 0.0
+
+        # {keyword: (expires_at, (tier, nodes) or None)}, in LRU order.
+        self.cache_ttl = cache_ttl
+        self._lookup_cache: OrderedDict[str, tuple[float, tuple[int, list[dict]] | None]] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+        # Cypher text is fixed per instance (only parameters vary), so every
+        # lookup reuses one cached server-side plan.
+        self._compile_queries()
 
     # ------------------------------------------------------------------
     # Public API
@@ -130,6 +231,31 @@ class QueryTimeEntityExtractor:
         Optimization: Avoids LLM call when n-gram extraction finds matches.
         This reduces API calls by ~50% for common queries.
         """
+        return self._extract(query)
+
+    def extract_entry_nodes_batch(self, queries: list[str]) -> dict[str, list[dict]]:
+        """
+        extract_entry_nodes() for many queries known up front.
+
+        The n-gram keywords of every query go to the graph in ONE batched
+        exact/partial lookup; each query then resolves against that shared
+        result, so only the fallback tiers (fuzzy, LLM, label, semantic) run
+        per query. Returns {query: entry nodes}.
+        """
+        queries = [q for q in dict.fromkeys(queries) if q and q.strip()]
+        keywords = [
+            kw for kw in dict.fromkeys(
+                kw for q in queries for kw in self._extract_keywords(q)
+            )
+            if self._may_exist(kw)
+        ]
+        batch = self._batch_match(keywords) if keywords else {}
+        return {q: self._extract(q, batch) for q in queries}
+
+    def _extract(
+        self, query: str, batch: dict[str, tuple[int, list[dict]]] | None = None
+    ) -> list[dict]:
+        """extract_entry_nodes(), optionally with the n-gram batch precomputed."""
         if not query or not query.strip():
             return []
 
@@ -138,12 +264,10 @@ class QueryTimeEntityExtractor:
 
         # 1. Try n-gram extraction FIRST (free, no LLM call)
         ngram_keywords = self._extract_keywords(query)
-        for candidate in ngram_keywords:
-            nodes = self._find_in_graph_v2(candidate)
-            for node in nodes:
-                if node["id"] not in seen_ids:
-                    seen_ids.add(node["id"])
-                    entry_nodes.append(node)
+        for node in self._lookup_candidates(ngram_keywords, batch):
+            if node["id"] not in seen_ids:
+                seen_ids.add(node["id"])
+                entry_nodes.append(node)
 
         # 2. If n-grams found matches, skip LLM call (saves API quota)
         if entry_nodes:
@@ -153,12 +277,10 @@ class QueryTimeEntityExtractor:
         # 3. LLM-aided extraction (only when n-grams fail)
         if self.llm:
             llm_entities = self._extract_entities_with_llm(query)
-            for candidate in llm_entities:
-                nodes = self._find_in_graph_v2(candidate)
-                for node in nodes:
-                    if node["id"] not in seen_ids:
-                        seen_ids.add(node["id"])
-                        entry_nodes.append(node)
+            for node in self._lookup_candidates(llm_entities):
+                if node["id"] not in seen_ids:
+                    seen_ids.add(node["id"])
+                    entry_nodes.append(node)
 
         if entry_nodes:
             return entry_nodes
@@ -177,6 +299,93 @@ class QueryTimeEntityExtractor:
         logger.info("Found %d entry node(s)", len(entry_nodes))
         return entry_nodes
 
+    def ensure_indexes(self) -> None:
+        """
+        Create the full-text index that serves fuzzy candidate lookup
+        (idempotent) and switch fuzzy matching onto it.
+
+        Opt-in schema change: call it when provisioning a graph you own; the
+        pipeline never runs it against user graphs. Exact/partial lookups
+        compare toLower() values, which no index can serve, so none is built
+        for them.
+        """
+        # Index scope only: lookups keep searching every label when
+        # node_labels is None, including labels created after this call.
+        labels = self.node_labels
+        if not labels:
+            rows = self.connector.execute_query("CALL db.labels() YIELD label RETURN label")
+            labels = sorted(row["label"] for row in rows)
+        self.connector.ensure_fulltext_index(_FULLTEXT_INDEX, labels, self.search_properties)
+        self._fulltext = True
+
+    def clear_cache(self) -> None:
+        """Drop every cached lookup result (e.g. after the graph changed)."""
+        with self._cache_lock:
+            self._lookup_cache.clear()
+
+    def invalidate(self) -> None:
+        """
+        Forget everything derived from graph contents (call after writes):
+        cached lookups and the trigram index, which reloads on the next lookup.
+        """
+        self._name_trigrams = None
+        self.clear_cache()
+
+    def cache_stats(self) -> dict:
+        """Hit/miss counters for the lookup cache and the n-gram cache."""
+        ngrams = _ngram_candidates.cache_info()
+        with self._cache_lock:
+            return {
+                "lookup_hits": self._cache_hits,
+                "lookup_misses": self._cache_misses,
+                "lookup_size": len(self._lookup_cache),
+                "ngram_hits": ngrams.hits,
+                "ngram_misses": ngrams.misses,
+            }
+
+    def refresh_name_index(self) -> None:
+        """
+        (Re)load the in-process trigram index of searchable values.
+
+        Graphs with more than _NAME_INDEX_CAP values are not indexed (the
+        prefilter is simply disabled), so memory stays bounded.
+        """
+        label_filter = self._build_label_filter()
+        cypher = f"""
+        MATCH (n{label_filter})
+        UNWIND $props AS p
+        WITH DISTINCT toLower(toString(n[p])) AS name
+        WHERE name IS NOT NULL
+        RETURN name LIMIT $cap
+        """
+        try:
+            rows = self.connector.execute_query(
+                cypher, {"props": self.search_properties, "cap": _NAME_INDEX_CAP + 1}
+            )
+        except Exception as e:
+            logger.debug("Name index unavailable: %s", e)
+            rows = []
+        names = [r["name"] for r in rows if isinstance(r, dict) and isinstance(r.get("name"), str)]
+        if len(names) > _NAME_INDEX_CAP:
+            logger.info("Name index skipped: more than %d searchable values", _NAME_INDEX_CAP)
+            names = []
+        self._name_trigrams = {name[i:i + 3] for name in names for i in range(len(name) - 2)}
+        self._name_index_expires = time.monotonic() + _NAME_INDEX_TTL
+        self.clear_cache()
+
+    def _may_exist(self, keyword: str) -> bool:
+        """
+        False only when no indexed value shares a trigram with keyword, i.e.
+        no exact, partial or fuzzy match is possible. Semantic search is not
+        gated: synonyms need not share any characters with a stored name.
+        """
+        if self._name_trigrams is None or time.monotonic() >= self._name_index_expires:
+            self.refresh_name_index()
+        kw = keyword.lower()
+        if not self._name_trigrams or len(kw) < 3:
+            return True
+        return any(kw[i:i + 3] in self._name_trigrams for i in range(len(kw) - 2))
+
     def _label_match(self, query: str) -> list[dict]:
         """
         Check if query mentions a graph label (node type) like 'drugs', 'diseases'.
@@ -192,7 +401,7 @@ class QueryTimeEntityExtractor:
                 WITH n, count(r) AS rels
                 ORDER BY rels DESC
                 RETURN elementId(n) as id, labels(n)[0] as label, 
-                       properties(n) as properties
+                       {self._projection()} as properties
                 LIMIT 5
                 """
                 rows = self.connector.execute_query(cypher)
@@ -205,18 +414,82 @@ class QueryTimeEntityExtractor:
     # V2 Search logic
     # ------------------------------------------------------------------
 
-    def _find_in_graph_v2(self, keyword: str) -> list[dict]:
-        """Hybrid search: Exact → Partial → Fuzzy → Semantic"""
-        # 1. Exact match
-        nodes = self._exact_match(keyword)
-        if nodes: return nodes
-
-        # 2. Partial match
-        nodes = self._partial_match(keyword)
-        if nodes: return nodes
-
+    def _lookup_candidates(
+        self, candidates: list[str], batch: dict[str, tuple[int, list[dict]]] | None = None
+    ) -> list[dict]:
+        """
+        Resolve candidates in order: one batched exact/partial query for all
+        of them (unless ``batch`` already holds that result), then the
+        per-keyword fuzzy/semantic fallback only for candidates the batch did
+        not resolve. Fallback lookups run concurrently; results are still
+        emitted in candidate order. The trigram prefilter only skips the
+        lexical tiers; rejected candidates still get a semantic lookup.
+        """
+        if not candidates:
+            return []
+        if batch is None:
+            lexical = [c for c in candidates if self._may_exist(c)]
+            batch = self._batch_match(lexical) if lexical else {}
+
+        # An exact hit on a multi-word phrase (e.g. "stomach bleeding") makes
+        # its sub-grams ("stomach", "bleeding") noise: skip them entirely.
+        consumed: list[str] = []
+        kept: list[str] = []
+        for candidate in candidates:
+            key = f" {candidate.lower()} "
+            if any(key in phrase for phrase in consumed):
+                continue
+            kept.append(candidate)
+            tier, _ = batch.get(candidate.lower(), (None, []))
+            if tier == 0 and " " in candidate.strip():
+                consumed.append(key)
+
+        unresolved = list(dict.fromkeys(c for c in kept if c.lower() not in batch))
+        fallback = self._fallback_many(unresolved)
+        nodes: list[dict] = []
+        for candidate in kept:
+            hit = batch.get(candidate.lower())
+            nodes.extend(hit[1] if hit else fallback.get(candidate, []))
+        return nodes
+
+    def _fallback_many(self, keywords: list[str]) -> dict[str, list[dict]]:
+        """
+        Fuzzy → Semantic for many keywords. With APOC, every fuzzy-eligible
+        keyword is scored in ONE UNWIND round-trip; whatever is left runs
+        _fallback_match per keyword, fanned out over a thread pool.
+        """
+        results: dict[str, list[dict]] = {}
+        scored: set[str] = set()
+        fuzzy_kws = [kw for kw in keywords if len(kw) > 3 and self._may_exist(kw)]
+        if fuzzy_kws and self._apoc_available is not False:
+            try:
+                results = self._batch_fuzzy_apoc(fuzzy_kws)
+                self._apoc_available = True
+                scored = set(fuzzy_kws)
+            except Exception:
+                logger.debug("APOC unavailable; falling back to client-side fuzzy scoring")
+                self._apoc_available = False
+
+        pending = [kw for kw in keywords if not results.get(kw)]
+        fuzzy = {kw: kw not in scored and self._may_exist(kw) for kw in pending}
+        if len(pending) <= 1:
+            results.update({kw: self._fallback_match(kw, fuzzy=fuzzy[kw]) for kw in pending})
+            return results
+        # The Neo4j driver is thread-safe and releases the GIL on socket I/O,
+        # so round-trips overlap instead of queueing.
+        with ThreadPoolExecutor(max_workers=min(_MAX_LOOKUP_WORKERS, len(pending))) as pool:
+            found = pool.map(lambda kw: self._fallback_match(kw, fuzzy=fuzzy[kw]), pending)
+            results.update(zip(pending, found))
+        return results
+
+    def _fallback_match(self, keyword: str, fuzzy: bool = True) -> list[dict]:
+        """
+        Fuzzy → Semantic, for keywords with no exact/partial hit.
+        fuzzy=False skips straight to semantic (already fuzzy-scored, or no
+        indexed value shares a trigram with keyword).
+        """
         # 3. Fuzzy match
-        if self._fuzzy_available and len(keyword) > 3:
+        if fuzzy and (self._fuzzy_available or self._apoc_available is not False) and len(keyword) > 3:
             nodes = self._fuzzy_match(keyword)
             if nodes: return nodes
             
@@ -257,12 +530,12 @@ Query: "{query}" """
 
         # Step 2a: Try Neo4j native vector index first (requires index setup)
         try:
-            vector_cypher = """
+            vector_cypher = f"""
             CALL db.index.vector.queryNodes('entity_embeddings', $limit, $embedding)
             YIELD node, score
             WHERE score >= $threshold
             RETURN elementId(node) as id, labels(node)[0] as label, 
-                   properties(node) as properties, score
+                   {self._projection("node")} as properties, score
             ORDER BY score DESC
             """
             rows = self.connector.execute_query(vector_cypher, {
@@ -284,7 +557,7 @@ Query: "{query}" """
         cypher = f"""
         MATCH (n{label_filter})
         WHERE n.{prop} IS NOT NULL
-        RETURN elementId(n) as id, labels(n)[0] as label, properties(n) as properties, n.{prop} as name
+        RETURN elementId(n) as id, labels(n)[0] as label, {self._projection()} as properties, n.{prop} as name
         LIMIT 500
         """
         rows = self.connector.execute_query(cypher)
@@ -321,55 +594,238 @@ Query: "{query}" """
 
     # 175: Keyword extraction (V1 logic preserved)
     def _extract_keywords(self, query: str) -> list[str]:
-        cleaned = re.sub(r"[^a-zA-Z0-9\s\-]", " ", query)
-        tokens = cleaned.lower().split()
-        content_tokens = [t for t in tokens if t not in self.stop_words]
-        if not content_tokens: content_tokens = tokens
-        candidates: list[str] = []
-        seen: set[str] = set()
-        for n in (3, 2, 1):
-            for i in range(len(content_tokens) - n + 1):
-                phrase = " ".join(content_tokens[i : i + n])
-                if phrase not in seen:
-                    seen.add(phrase)
-                    candidates.append(phrase)
-        return candidates
+        return list(_ngram_candidates(query, self.stop_words))
 
     def _build_label_filter(self) -> str:
         if not self.node_labels: return ""
-        return ":" + "|".join(self.node_labels)
+        return ":" + "|".join(f"`{label}`" for label in self.node_labels)
 
-    def _exact_match(self, keyword: str) -> list[dict]:
-        label_filter = self._build_label_filter()
-        conditions = " OR ".join(f"toLower(n.{prop}) = $keyword" for prop in self.search_properties)
-        cypher = f"MATCH (n{label_filter}) WHERE {conditions} RETURN elementId(n) AS id, labels(n)[0] AS label, properties(n) AS properties LIMIT 10"
-        rows = self.connector.execute_query(cypher, {"keyword": keyword.lower()})
-        return [self._row_to_node(r) for r in rows]
+    def _projection(self, var: str = "n") -> str:
+        """Map projection of return_properties, e.g. n{.`name`, .`brand_name`}."""
+        keys = ", ".join(f".`{prop}`" for prop in self.return_properties)
+        return f"{var}{{{keys}}}"
 
-    def _partial_match(self, keyword: str) -> list[dict]:
+    def _compile_queries(self) -> None:
+        """
+        Build the lookup Cypher strings once. Labels and the primary property
+        are fixed per instance and the searched properties travel as $props,
+        so every lookup reuses one cached server-side plan.
+        """
         label_filter = self._build_label_filter()
-        conditions = " OR ".join(f"toLower(n.{prop}) CONTAINS $keyword" for prop in self.search_properties)
-        cypher = f"MATCH (n{label_filter}) WHERE {conditions} RETURN elementId(n) AS id, labels(n)[0] AS label, properties(n) AS properties LIMIT 10"
-        rows = self.connector.execute_query(cypher, {"keyword": keyword.lower()})
-        return [self._row_to_node(r) for r in rows]
+        expr = "toLower(n[p])"
+        primary = self.search_properties[0]
+        projection = self._projection()
+        node_cols = f"elementId(n) AS id, labels(n)[0] AS label, {projection} AS properties"
+
+        self._batch_cypher = f"""
+        UNWIND $keywords AS kw
+        MATCH (n{label_filter})
+        WITH kw, n, [p IN $props | {expr}] AS vals
+        WHERE any(v IN vals WHERE v = kw OR v CONTAINS kw)
+        WITH kw, n, CASE WHEN kw IN vals THEN 0 ELSE 1 END AS tier
+        ORDER BY tier
+        WITH kw, collect({{id: elementId(n), label: labels(n)[0],
+                           properties: {projection}, tier: tier}})[..10] AS hits
+        UNWIND hits AS h
+        RETURN kw AS matched_kw, h.id AS id, h.label AS label,
+               h.properties AS properties, h.tier AS tier
+        """
+        self._fuzzy_apoc_cypher = f"""
+        MATCH (n{label_filter})
+        WHERE size(n.{primary}) >= $min_len AND size(n.{primary}) <= $max_len
+        WITH n, apoc.text.levenshteinSimilarity(toLower(n.{primary}), $keyword) AS sim
+        WHERE sim >= $threshold
+        RETURN {node_cols}, sim
+        ORDER BY sim DESC LIMIT 5
+        """
+        self._batch_fuzzy_apoc_cypher = f"""
+        UNWIND $rows AS row
+        MATCH (n{label_filter})
+        WHERE size(n.{primary}) >= row.min_len AND size(n.{primary}) <= row.max_len
+        WITH row, n, apoc.text.levenshteinSimilarity(toLower(n.{primary}), row.kw) AS sim
+        WHERE sim >= $threshold
+        WITH row, n, sim ORDER BY sim DESC
+        WITH row, collect({{id: elementId(n), label: labels(n)[0],
+                            properties: {projection}}})[..5] AS hits
+        UNWIND hits AS h
+        RETURN row.key AS matched_kw, h.id AS id, h.label AS label, h.properties AS properties
+        """
+        # Skinny prefilter (id + name only); full properties are fetched
+        # afterwards for the few winners via _nodes_by_id_cypher.
+        self._fuzzy_client_cypher = (
+            f"MATCH (n{label_filter}) WHERE size(toLower(n.{primary})) >= $min_len "
+            f"AND size(toLower(n.{primary})) <= $max_len "
+            f"RETURN elementId(n) AS id, toLower(n.{primary}) AS candidate_name LIMIT 500"
+        )
+        self._fuzzy_fulltext_cypher = (
+            f"CALL db.index.fulltext.queryNodes($index, $terms) YIELD node AS n "
+            f"WHERE size(toLower(n.{primary})) >= $min_len "
+            f"AND size(toLower(n.{primary})) <= $max_len "
+            f"RETURN elementId(n) AS id, toLower(n.{primary}) AS candidate_name LIMIT 500"
+        )
+        self._nodes_by_id_cypher = f"MATCH (n) WHERE elementId(n) IN $ids RETURN {node_cols}"
+
+    def _batch_match(self, keywords: list[str]) -> dict[str, tuple[int, list[dict]]]:
+        """
+        Exact/partial match for many keywords in ONE round-trip via UNWIND.
+
+        Returns {lowercased keyword: (tier, nodes)}, keeping at most 10 rows
+        per keyword and only the best tier for each (0 = exact, 1 = partial),
+        which preserves exact-before-partial precedence.
+        """
+        keywords_lower = list(dict.fromkeys(k.lower() for k in keywords))
+        result, pending = self._cache_get(keywords_lower)
+        if not pending:
+            return result
+        rows = self.connector.execute_query(
+            self._batch_cypher, {"keywords": pending, "props": self.search_properties}
+        )
+
+        grouped: dict[str, list[dict]] = {}
+        for row in rows:
+            grouped.setdefault(row.get("matched_kw", ""), []).append(row)
+
+        fetched: dict[str, tuple[int, list[dict]]] = {}
+        for kw, kw_rows in grouped.items():
+            best_tier = min(r.get("tier", 0) for r in kw_rows)
+            fetched[kw] = (
+                best_tier,
+                [self._row_to_node(r) for r in kw_rows if r.get("tier", 0) == best_tier],
+            )
+        self._cache_put(pending, fetched)
+        result.update(fetched)
+        return result
+
+    def _cache_get(self, keywords: list[str]) -> tuple[dict[str, tuple[int, list[dict]]], list[str]]:
+        """Split keywords into cached batch results and those still to fetch."""
+        if self.cache_ttl <= 0:
+            return {}, keywords
+        now = time.monotonic()
+        hits: dict[str, tuple[int, list[dict]]] = {}
+        pending: list[str] = []
+        with self._cache_lock:
+            for kw in keywords:
+                entry = self._lookup_cache.get(kw)
+                if entry is None or entry[0] <= now:
+                    pending.append(kw)
+                    continue
+                self._lookup_cache.move_to_end(kw)
+                if entry[1] is not None:
+                    hits[kw] = entry[1]
+            self._cache_hits += len(keywords) - len(pending)
+            self._cache_misses += len(pending)
+        return hits, pending
+
+    def _cache_put(self, keywords: list[str], found: dict[str, tuple[int, list[dict]]]) -> None:
+        if self.cache_ttl <= 0:
+            return
+        expires = time.monotonic() + self.cache_ttl
+        with self._cache_lock:
+            for kw in keywords:
+                self._lookup_cache[kw] = (expires, found.get(kw))
+                self._lookup_cache.move_to_end(kw)
+            while len(self._lookup_cache) > _LOOKUP_CACHE_SIZE:
+                self._lookup_cache.popitem(last=False)
 
     def _fuzzy_match(self, keyword: str) -> list[dict]:
-        import Levenshtein
-        primary_prop = self.search_properties[0]
-        label_filter = self._build_label_filter()
+        """
+        Levenshtein fuzzy match. Scored server-side with APOC when available
+        so only the winners cross the wire; otherwise candidates are pulled
+        and scored client-side with python-Levenshtein.
+        """
         kw_len = len(keyword)
         min_len, max_len = max(1, kw_len - kw_len // 2), kw_len + kw_len // 2
-        cypher = f"MATCH (n{label_filter}) WHERE size(toLower(n.{primary_prop})) >= $min_len AND size(toLower(n.{primary_prop})) <= $max_len RETURN elementId(n) AS id, labels(n)[0] AS label, properties(n) AS properties, toLower(n.{primary_prop}) AS candidate_name LIMIT 200"
-        rows = self.connector.execute_query(cypher, {"min_len": min_len, "max_len": max_len})
-        scored = []
+
+        if self._apoc_available is not False:
+            try:
+                nodes = self._fuzzy_match_apoc(keyword, min_len, max_len)
+                self._apoc_available = True
+                return nodes
+            except Exception:
+                logger.debug("APOC unavailable; falling back to client-side fuzzy scoring")
+                self._apoc_available = False
+
+        if not self._fuzzy_available:
+            return []
+        return self._fuzzy_match_client(keyword, min_len, max_len)
+
+    def _fuzzy_match_apoc(self, keyword: str, min_len: int, max_len: int) -> list[dict]:
+        rows = self.connector.execute_query(self._fuzzy_apoc_cypher, {
+            "keyword": keyword.lower(),
+            "min_len": min_len,
+            "max_len": max_len,
+            "threshold": self.fuzzy_threshold,
+        })
+        return [self._row_to_node(r) for r in rows]
+
+    def _batch_fuzzy_apoc(self, keywords: list[str]) -> dict[str, list[dict]]:
+        """APOC fuzzy match for many keywords at once: {keyword: top-5 nodes}."""
+        rows = []
+        for kw in keywords:
+            kw_len = len(kw)
+            rows.append({
+                "key": kw,
+                "kw": kw.lower(),
+                "min_len": max(1, kw_len - kw_len // 2),
+                "max_len": kw_len + kw_len // 2,
+            })
+        result: dict[str, list[dict]] = {}
+        for row in self.connector.execute_query(
+            self._batch_fuzzy_apoc_cypher, {"rows": rows, "threshold": self.fuzzy_threshold}
+        ):
+            result.setdefault(row["matched_kw"], []).append(self._row_to_node(row))
+        return result
+
+    def _fuzzy_match_client(self, keyword: str, min_len: int, max_len: int) -> list[dict]:
+        cypher = self._fuzzy_client_cypher
         kw_lower = keyword.lower()
-        for row in rows:
-            name = row.get("candidate_name")
-            if name:
-                ratio = Levenshtein.ratio(kw_lower, name)
-                if ratio >= self.fuzzy_threshold: scored.append((ratio, row))
-        scored.sort(key=lambda x: x[0], reverse=True)
-        return [self._row_to_node(r) for _, r in scored[:5]]
+        threshold = self.fuzzy_threshold
+        params = {"min_len": min_len, "max_len": max_len}
+        terms = self._fuzzy_terms(kw_lower) if self._fulltext else ""
+        if terms:
+            # Index probe (Lucene edit-distance terms) instead of a label scan
+            cypher = self._fuzzy_fulltext_cypher
+            params.update(index=_FULLTEXT_INDEX, terms=terms)
+
+        if self._fuzzy_backend == "rapidfuzz":
+            from rapidfuzz import fuzz, process
+            names = {
+                r["id"]: r["candidate_name"]
+                for r in self.connector.stream_query(cypher, params)
+                if r.get("candidate_name")
+            }
+            hits = process.extract(
+                kw_lower, names, scorer=fuzz.ratio, score_cutoff=threshold * 100, limit=5
+            )
+            return self._fetch_nodes([node_id for _, _, node_id in hits])
+
+        import Levenshtein
+
+        def _scored():
+            # Score rows as they stream in; only passing rows are retained.
+            for row in self.connector.stream_query(cypher, params):
+                name = row.get("candidate_name")
+                if name:
+                    # score_cutoff lets the C scorer bail out early; 0.0 = miss
+                    ratio = Levenshtein.ratio(kw_lower, name, score_cutoff=threshold)
+                    if ratio: yield ratio, row["id"]
+
+        best = heapq.nlargest(5, _scored(), key=lambda x: x[0])
+        return self._fetch_nodes([node_id for _, node_id in best])
+
+    @staticmethod
+    def _fuzzy_terms(keyword: str) -> str:
+        """Lucene query matching any word of keyword within edit distance 2."""
+        words = (_LUCENE_SPECIAL_RE.sub(r"\\\1", w) for w in keyword.split())
+        return " OR ".join(f"{w}~" for w in words if w)
+
+    def _fetch_nodes(self, ids: list[str]) -> list[dict]:
+        """Full node rows for the given element ids, in the order given."""
+        if not ids:
+            return []
+        rows = self.connector.execute_query(self._nodes_by_id_cypher, {"ids": ids})
+        by_id = {r["id"]: r for r in rows}
+        return [self._row_to_node(by_id[i]) for i in ids if i in by_id]
 
     @staticmethod
     def _row_to_node(row: dict) -> dict:
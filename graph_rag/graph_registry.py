@@ -290,6 +290,17 @@ class GraphRegistry:
             logger.info("Deleted KG %s", kg_id)
         return deleted
 
+    def invalidate(self, kg_id: str) -> bool:
+        """
+        Drop the cached lookups and traversals of a KG's live pipeline, e.g.
+        after writing to that graph. Returns False if no pipeline is cached.
+        """
+        pipeline = self._pipelines.get(kg_id)
+        if pipeline is None:
+            return False
+        pipeline.invalidate()
+        return True
+
     # ------------------------------------------------------------------
     # Public API: Runtime Access
     # ------------------------------------------------------------------
@@ -1,15 +1,70 @@
-import json
 import logging
+import re
+from functools import lru_cache
 from typing import Optional
+from .config import load_config
 from .llm_interface import LLMInterface
 
+try:
+    import ahocorasick
+except ImportError:  # optional: falls back to a compiled regex alternation
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
-def _load_config(config_path_or_dict) -> dict:
-    if isinstance(config_path_or_dict, dict):
-        return config_path_or_dict
-    with open(config_path_or_dict) as f:
-        return json.load(f)
+
+class _NormalizedQuery(str):
+    """
+    A lowercased, whitespace-collapsed query that still carries the user's
+    text in ``original``. It hashes and compares as the normalised string,
+    so the memo keys on that alone while the LLM sees what the user typed.
+    """
+
+    def __new__(cls, query: str):
+        self = super().__new__(cls, " ".join(query.lower().split()))
+        self.original = query
+        return self
+
+@lru_cache(maxsize=16)
+def _build_automaton(patterns: tuple[tuple[str, tuple[str, ...]], ...]):
+    """
+    One Aho-Corasick automaton over every keyword, built once per distinct
+    set of intent patterns. Values carry the intent's config rank so the
+    earliest-declared matching intent still wins, as with the linear scan.
+    """
+    automaton = ahocorasick.Automaton()
+    for rank, (name, keywords) in enumerate(patterns):
+        for kw in keywords:
+            if kw and (kw not in automaton or automaton.get(kw)[0] > rank):
+                automaton.add_word(kw, (rank, name))
+    if not len(automaton):
+        return None
+    automaton.make_automaton()
+    return automaton
+
+
+@lru_cache(maxsize=16)
+def _build_keyword_regex(patterns: tuple[tuple[str, tuple[str, ...]], ...]) -> Optional[re.Pattern]:
+    """
+    Dependency-free equivalent of _build_automaton: one alternation with a
+    group per intent, named "_<rank>". It sits inside a lookahead so
+    finditer reports a hit at every offset (overlapping keywords included),
+    and alternation order makes the lowest rank win at each offset.
+    """
+    groups = [
+        f"(?P<_{rank}>{'|'.join(re.escape(kw) for kw in keywords if kw)})"
+        for rank, (_, keywords) in enumerate(patterns)
+        if any(keywords)
+    ]
+    if not groups:
+        return None
+    return re.compile(f"(?=(?:{'|'.join(groups)}))")
+
+
+@lru_cache(maxsize=4)
+def _build_marker_regex(markers: frozenset[str]) -> re.Pattern:
+    """Plain alternation over the abstract-query markers (any hit is enough)."""
+    return re.compile("|".join(re.escape(m) for m in sorted(markers, key=len, reverse=True)))
 
 
 class IntentClassifier:
@@ -26,7 +81,7 @@ class IntentClassifier:
     })
 
     def __init__(self, config: str | dict, llm: Optional[LLMInterface] = None):
-        loaded = _load_config(config)
+        loaded = load_config(config)
         self.llm = llm
         
         # Keep V1 patterns as a robust fallback
@@ -35,25 +90,47 @@ class IntentClassifier:
             for name, pattern in loaded["intent_patterns"].items()
         }
         
+        # Single-pass keyword matcher shared by every classifier on this config
+        patterns = tuple((name, tuple(kws)) for name, kws in self._patterns.items())
+        self._intent_names = [name for name, _ in patterns]
+        self._automaton = None
+        self._keyword_re = None
+        if ahocorasick is not None:
+            self._automaton = _build_automaton(patterns)
+        else:
+            self._keyword_re = _build_keyword_regex(patterns)
+
+        self._marker_re = _build_marker_regex(frozenset(self.ABSTRACT_MARKERS))
+
         # Meta-information for LLM classification
         self._intent_descriptions = {
             name: pattern.get("description", f"Search for {name}")
             for name, pattern in loaded["intent_patterns"].items()
         }
 
+        # Per-instance memo for the deterministic (no-LLM) path; a
+        # method-level lru_cache would pin self.
+        self._classify_cached = lru_cache(maxsize=4096)(self._classify_normalized)
+
     def classify(self, query: str) -> str:
         """
         Hybrid Classification: Abstract Detection → LLM Inference → Keyword Match → General.
+
+        Without an LLM the result is a pure function of the config, so it is
+        memoised per normalised query (lowercased, whitespace collapsed).
+        LLM answers are not cached: they can change with the model or prompt.
         """
-        q_lower = query.lower()
+        if self.llm:
+            return self._classify_normalized(_NormalizedQuery(query))
+        return self._classify_cached(_NormalizedQuery(query))
+
+    def _classify_normalized(self, q_lower: _NormalizedQuery) -> str:
+        query = q_lower.original
 
         # Priority 1: Abstract/meta query detection
-        if any(marker in q_lower for marker in self.ABSTRACT_MARKERS):
+        if self._marker_re.search(q_lower):
             # Only use abstract if no specific intent keyword also matches
-            has_specific = any(
-                any(kw in q_lower for kw in keywords)
-                for keywords in self._patterns.values()
-            )
+            has_specific = self._match_keywords(q_lower) is not None
             if not has_specific:
                 logger.info("Abstract query detected: '%s'", query)
                 return "abstract"
@@ -66,13 +143,36 @@ class IntentClassifier:
                 return intent
 
         # Priority 3: Keyword Matching
-        for intent, keywords in self._patterns.items():
-            if any(kw in q_lower for kw in keywords):
-                logger.debug("Keyword match for intent: %s", intent)
-                return intent
+        intent = self._match_keywords(q_lower)
+        if intent:
+            logger.debug("Keyword match for intent: %s", intent)
+            return intent
                 
         return "general"
 
+    def _match_keywords(self, q_lower: str) -> Optional[str]:
+        """First intent (in config order) with a keyword contained in q_lower."""
+        if self._automaton is not None:
+            best: Optional[tuple[int, str]] = None
+            for _, hit in self._automaton.iter(q_lower):
+                if best is None or hit[0] < best[0]:
+                    best = hit
+                    if best[0] == 0:
+                        break
+            return best[1] if best else None
+
+        if self._keyword_re is not None:
+            best_rank: Optional[int] = None
+            for m in self._keyword_re.finditer(q_lower):
+                rank = int(m.lastgroup[1:])
+                if best_rank is None or rank < best_rank:
+                    best_rank = rank
+                    if rank == 0:
+                        break
+            return self._intent_names[best_rank] if best_rank is not None else None
+
+        return None
+
     def _classify_with_llm(self, query: str) -> Optional[str]:
         """Ask the LLM to pick the best intent from the available list."""
         intent_list = "\n".join([f"- {name}: {desc}" for name, desc in self._intent_descriptions.items()])
@@ -17,6 +17,7 @@ Usage
 """
 
 import os
+import re
 import logging
 from google import genai
 from google.genai import types
@@ -41,6 +42,21 @@ ANSWER:\
 
 logger = logging.getLogger(__name__)
 
+# Server-suggested wait in a 429 error: "retryDelay': '23s'" (RetryInfo
+# detail) or "Please retry in 23.4s." (message text).
+_RETRY_DELAY_RE = re.compile(
+    r"(?:retry_?delay\W*|retry in\s+)(\d+(?:\.\d+)?)s", re.IGNORECASE
+)
+
+
+def retry_delay_seconds(error: Exception) -> float | None:
+    """Wait (seconds) the API asked for in a rate-limit error, if it said."""
+    delay = getattr(error, "retry_delay", None)
+    if delay is not None:
+        return delay.total_seconds() if hasattr(delay, "total_seconds") else float(delay)
+    match = _RETRY_DELAY_RE.search(str(error))
+    return float(match.group(1)) if match else None
+
 
 class LLMInterface:
     """
@@ -76,6 +92,9 @@ class LLMInterface:
         self._model = model
         self._max_retries = max_retries
 
+        # The system prompt never changes, so its request config is built once.
+        self._answer_config = types.GenerateContentConfig(system_instruction=_SYSTEM_PROMPT)
+
         # Embedding model can vary across Gemini API accounts/regions/versions.
         # We keep a preferred model plus fallbacks and auto-switch when needed.
         preferred_embed_model = os.getenv("GEMINI_EMBED_MODEL", "text-embedding-004")
@@ -165,9 +184,10 @@ class LLMInterface:
             except Exception as e:
                 err_str = str(e)
                 if "429" in err_str or "RESOURCE_EXHAUSTED" in err_str:
-                    wait = 2 ** (attempt + 1)  # 2s, 4s, 8s
+                    # Honour the server's retry hint; else 2s, 4s, 8s
+                    wait = retry_delay_seconds(e) or 2 ** (attempt + 1)
                     logger.warning(
-                        "Rate limited (attempt %d/%d). Retrying in %ds...",
+                        "Rate limited (attempt %d/%d). Retrying in %.1fs...",
                         attempt + 1, self._max_retries + 1, wait
                     )
                     last_error = e
@@ -186,7 +206,7 @@ class LLMInterface:
             response = self._client.models.generate_content(
                 model=self._model,
                 contents=prompt,
-                config=types.GenerateContentConfig(system_instruction=_SYSTEM_PROMPT),
+                config=self._answer_config,
             )
             return response.text.strip()
 
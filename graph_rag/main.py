@@ -103,23 +103,68 @@ SAMPLE_RELATIONSHIPS = [
 ]
 
 
-def seed_sample_graph(connector: GraphDBConnector) -> None:
-    """Seed the sample medical knowledge graph."""
-    print("\n  Clearing existing data …")
-    connector.execute_query("MATCH (n) DETACH DELETE n")
+# Above this many rows in any one UNWIND group, the seed switches from one
+# all-or-nothing transaction to server-side CALL { } IN TRANSACTIONS batches.
+SEED_BATCH_ROWS = 500
+
 
-    print(f"  Creating {len(SAMPLE_NODES)} nodes …")
+def seed_sample_graph(connector: GraphDBConnector) -> None:
+    """
+    Seed the sample medical knowledge graph.
+
+    Small seeds (like the sample) wipe and write in one transaction. Once a
+    node or relationship group exceeds SEED_BATCH_ROWS, the same statements
+    run as server-side batches of SEED_BATCH_ROWS rows instead, which keeps
+    transaction memory bounded for ontology-sized imports.
+    """
+    # One UNWIND per label / relationship shape instead of one query per row
+    nodes_by_label: dict[str, list[dict]] = {}
     for name, label, props in SAMPLE_NODES:
-        connector.execute_query(
-            f"MERGE (n:{label} {{name: $name}}) SET n += $props",
-            {"name": name, "props": props},
-        )
+        nodes_by_label.setdefault(label, []).append({"name": name, "props": props})
 
-    print(f"  Creating {len(SAMPLE_RELATIONSHIPS)} relationships …")
+    label_of = {name: label for name, label, _ in SAMPLE_NODES}
+    rels_by_shape: dict[tuple[str, str, str], list[dict]] = {}
     for src, rel, tgt in SAMPLE_RELATIONSHIPS:
-        connector.execute_query(
-            f"MATCH (a {{name: $src}}), (b {{name: $tgt}}) MERGE (a)-[:{rel}]->(b)",
-            {"src": src, "tgt": tgt},
+        rels_by_shape.setdefault((label_of[src], rel, label_of[tgt]), []).append(
+            {"src": src, "tgt": tgt}
+        )
+
+    # Schema changes can't share a transaction with data writes, so the
+    # indexes (which turn the relationship MATCHes into lookups) go first.
+    with connector.session() as session:
+        for label in nodes_by_label:
+            session.run(
+                f"CREATE INDEX {label.lower()}_name IF NOT EXISTS FOR (n:{label}) ON (n.name)"
+            ).consume()
+
+    # Per-row write bodies; bulk_write / the UNWIND below bind each row as `row`
+    writes: list[tuple[str, list[dict]]] = [
+        (f"MERGE (n:{label} {{name: row.name}}) SET n += row.props", rows)
+        for label, rows in nodes_by_label.items()
+    ] + [
+        (
+            f"MATCH (a:{src_label} {{name: row.src}}), (b:{tgt_label} {{name: row.tgt}}) "
+            f"MERGE (a)-[:{rel}]->(b)",
+            rows,
+        )
+        for (src_label, rel, tgt_label), rows in rels_by_shape.items()
+    ]
+
+    print("\n  Clearing existing data …")
+    print(f"  Creating {len(SAMPLE_NODES)} nodes, {len(SAMPLE_RELATIONSHIPS)} relationships …")
+    if max(len(rows) for _, rows in writes) > SEED_BATCH_ROWS:
+        with connector.session() as session:
+            session.run(
+                f"MATCH (n) CALL {{ WITH n DETACH DELETE n }} "
+                f"IN TRANSACTIONS OF {SEED_BATCH_ROWS} ROWS"
+            ).consume()
+        for body, rows in writes:
+            connector.bulk_write(body, rows, batch_size=SEED_BATCH_ROWS)
+    else:
+        # Wipe + all writes commit together in one transaction
+        connector.execute_write(
+            [("MATCH (n) DETACH DELETE n", None)]
+            + [(f"UNWIND $rows AS row {body}", {"rows": rows}) for body, rows in writes]
         )
     print("  Done.\n")
 
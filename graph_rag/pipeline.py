@@ -27,6 +27,7 @@ from __future__ import annotations
 import os
 import time
 import logging
+from collections import Counter
 from typing import Optional
 
 from .connector import GraphDBConnector
@@ -34,7 +35,7 @@ from .schema_discovery import SchemaDiscovery
 from .auto_config import AutoConfigGenerator
 from .entity_extractor import QueryTimeEntityExtractor
 from .intent_classifier import IntentClassifier
-from .traversal_engine import SmartTraversalEngine
+from .traversal_engine import SmartTraversalEngine, subgraph_columns
 from .context_generator import ContextGenerator
 from .subgraph_filter import SubgraphFilter
 from .path_scorer import PathScorer
@@ -129,6 +130,11 @@ class GraphRAGPipeline:
         )
         self.classifier = IntentClassifier(self.config, llm=self.llm)
         self.engine     = SmartTraversalEngine(self.connector, self.config)
+        try:
+            self.engine.preflight()
+        except Exception as e:
+            # Plan warm-up is an optimisation; queries still plan on first use.
+            logger.warning("Traversal preflight skipped: %s", e)
         self.generator  = ContextGenerator(self.config, llm=self.llm)
         self.subgraph_filter = SubgraphFilter(self.config)
         self.path_scorer     = PathScorer(self.config)
@@ -304,35 +310,30 @@ class GraphRAGPipeline:
         E.g., Drug → TREATS Disease (5x), CAUSES SideEffect (3x)
         → "Drugs are primarily used to treat diseases."
         """
-        nodes = subgraph.get("nodes", [])
-        relationships = subgraph.get("relationships", [])
-        if not relationships:
+        if not subgraph.get("relationships"):
             return ""
+        cols = subgraph_columns(subgraph)
 
-        id_to_name = {n["id"]: n.get("name") or n.get("label", "?") for n in nodes}
+        id_to_name = {
+            nid: name or label
+            for nid, name, label in zip(cols["node_ids"], cols["node_names"], cols["node_labels"])
+        }
 
-        # Group by relationship type with examples
-        groups: dict[str, list[str]] = {}
-        for rel in relationships:
-            rel_type = rel["type"]
-            src = id_to_name.get(rel["source_id"], "?")
-            tgt = id_to_name.get(rel["target_id"], "?")
-            if rel_type not in groups:
-                groups[rel_type] = []
-            groups[rel_type].append(f"{src} → {tgt}")
+        # Group by relationship type: count + first example (only one is shown,
+        # so the rest are never formatted)
+        counts = Counter(cols["rel_types"])
+        samples: dict[str, str] = {}
+        for rel_type, src, tgt in zip(cols["rel_types"], cols["rel_srcs"], cols["rel_tgts"]):
+            if rel_type not in samples:
+                samples[rel_type] = f"{id_to_name.get(src, '?')} → {id_to_name.get(tgt, '?')}"
 
         # Build pattern context
         lines = ["RELATIONSHIP PATTERNS (sorted by frequency):"]
-        for rel_type, examples in sorted(groups.items(), key=lambda x: -len(x[1])):
-            tmpl = self.generator._rel_templates.get(rel_type, f"{{source}} {rel_type} {{target}}")
-            sample = examples[0] if examples else "?"
-            lines.append(f"  - {rel_type}: {len(examples)} instance(s) — e.g., \"{sample}\"")
+        for rel_type, count in sorted(counts.items(), key=lambda x: -x[1]):
+            lines.append(f"  - {rel_type}: {count} instance(s) — e.g., \"{samples[rel_type]}\"")
 
         # Also list unique entity types involved
-        label_counts: dict[str, int] = {}
-        for n in nodes:
-            lbl = n.get("label", "Unknown")
-            label_counts[lbl] = label_counts.get(lbl, 0) + 1
+        label_counts = Counter(cols["node_labels"])
         lines.append("\nENTITY TYPES:")
         for lbl, cnt in sorted(label_counts.items(), key=lambda x: -x[1]):
             lines.append(f"  - {lbl}: {cnt} node(s)")
@@ -390,6 +391,11 @@ Focus: """
         print(f"{'─' * 60}\n")
         return result.get("answer", result["context"])
 
+    def invalidate(self) -> None:
+        """Drop every cache derived from graph contents; call after writing to the graph."""
+        self.engine.invalidate()
+        self.extractor.invalidate()
+
     def close(self):
         """Close the Neo4j connection."""
         self.connector.close()
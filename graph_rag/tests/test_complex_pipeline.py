@@ -11,15 +11,18 @@ Run:
 """
 
 import os
+import random
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 from connector import GraphDBConnector
 from entity_extractor import QueryTimeEntityExtractor
 from intent_classifier import IntentClassifier
 from traversal_engine import SmartTraversalEngine
 from context_generator import ContextGenerator
-from llm_interface import LLMInterface
+from llm_interface import LLMInterface, retry_delay_seconds
 
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "config", "medical_graph.json")
 
@@ -128,57 +131,57 @@ TESTS = [
         "1-hop side effects",
         "What are the side effects of aspirin?",
         "side_effects", "targeted",
-        {"Aspirin"},
-        {"Nausea", "Stomach Bleeding"},
+        frozenset({"Aspirin"}),
+        frozenset({"Nausea", "Stomach Bleeding"}),
     ),
     (
         "1-hop treated-by (reverse)",
         "What treats headaches?",
         "treated_by", "targeted",
-        {"Headache"},
-        {"Aspirin", "Ibuprofen"},
+        frozenset({"Headache"}),
+        frozenset({"Aspirin", "Ibuprofen"}),
     ),
     (
         "1-hop drug interaction",
         "Can I take aspirin with warfarin?",
         "interaction", "targeted",
-        {"Aspirin", "Warfarin"},
-        {"Aspirin", "Warfarin"},
+        frozenset({"Aspirin", "Warfarin"}),
+        frozenset({"Aspirin", "Warfarin"}),
     ),
     (
         "2-hop chained: Drug→Disease→Symptom",
         "What symptoms does aspirin indirectly cause through the diseases it treats?",
         "indirect_symptoms", "chained",
-        {"Aspirin"},
-        {"Severe Pain", "Chest Pain"},   # Headache→Severe Pain, HeartDisease→Chest Pain
+        frozenset({"Aspirin"}),
+        frozenset({"Severe Pain", "Chest Pain"}),   # Headache→Severe Pain, HeartDisease→Chest Pain
     ),
     (
         "2-hop chained: Drug→SideEffect→Disease (risk chain)",
         "What diseases does aspirin lead to through its side effects?",
         "drug_risk_chain", "chained",
-        {"Aspirin"},
-        {"Peptic Ulcer"},                # Stomach Bleeding→INCREASES_RISK_OF→Peptic Ulcer
+        frozenset({"Aspirin"}),
+        frozenset({"Peptic Ulcer"}),                # Stomach Bleeding→INCREASES_RISK_OF→Peptic Ulcer
     ),
     (
         "2-hop variable neighborhood",
         "Give me an overview of metformin",
         "neighborhood", "variable_hop",
-        {"Metformin"},
-        {"Diabetes", "Frequent Urination"},  # Metformin→Diabetes (hop1), Diabetes→Symptom (hop2)
+        frozenset({"Metformin"}),
+        frozenset({"Diabetes", "Frequent Urination"}),  # Metformin→Diabetes (hop1), Diabetes→Symptom (hop2)
     ),
     (
         "shortest path between two nodes",
         "How is aspirin connected to peptic ulcer?",
         "connection", "shortest_path",
-        {"Aspirin", "Peptic Ulcer"},
-        {"Stomach Bleeding"},          # path: Aspirin→Stomach Bleeding→Peptic Ulcer
+        frozenset({"Aspirin", "Peptic Ulcer"}),
+        frozenset({"Stomach Bleeding"}),          # path: Aspirin→Stomach Bleeding→Peptic Ulcer
     ),
     (
         "shared neighbor: common side effects",
         "What side effects do aspirin and ibuprofen share?",
         "shared_effects", "shared_neighbor",
-        {"Aspirin", "Ibuprofen"},
-        {"Nausea"},                    # both cause Nausea
+        frozenset({"Aspirin", "Ibuprofen"}),
+        frozenset({"Nausea"}),                    # both cause Nausea
     ),
 ]
 
@@ -187,87 +190,157 @@ TESTS = [
 # Helpers
 # ---------------------------------------------------------------------------
 
+class RateLimiter:
+    """Spaces calls at least 60/rpm seconds apart, sleeping only the residual."""
+
+    def __init__(self, rpm: int = 5):
+        self.interval = 60.0 / rpm
+        self.next_allowed = 0.0
+
+    def wait(self) -> None:
+        now = time.monotonic()
+        if now < self.next_allowed:
+            time.sleep(self.next_allowed - now)
+        self.next_allowed = time.monotonic() + self.interval
+
+
+def backoff_delay(exc: Exception, attempt: int) -> float:
+    """Server-suggested retry delay (else 5s, 10s, 20s …) plus a little jitter."""
+    delay = retry_delay_seconds(exc) or 5 * 2 ** attempt
+    return delay + random.uniform(0, 0.5)
+
+
 def seed_graph(connector: GraphDBConnector) -> None:
     print("\n── Seeding rich medical graph ───────────────────────────────────────")
-    connector.execute_query("MATCH (n) DETACH DELETE n")
+
+    # One UNWIND per label / relationship shape instead of one query per row
+    nodes_by_label: dict[str, list[dict]] = {}
     for name, label, props in NODES:
-        connector.execute_query(
-            f"MERGE (n:{label} {{name: $name}}) SET n += $props",
-            {"name": name, "props": props},
-        )
+        nodes_by_label.setdefault(label, []).append({"name": name, "props": props})
+
+    label_of = {name: label for name, label, _ in NODES}
+    rels_by_shape: dict[tuple[str, str, str], list[dict]] = {}
     for src, rel, tgt in RELATIONSHIPS:
-        connector.execute_query(
-            f"MATCH (a {{name: $src}}), (b {{name: $tgt}}) MERGE (a)-[:{rel}]->(b)",
-            {"src": src, "tgt": tgt},
-        )
+        shape = (label_of[src], rel, label_of[tgt])
+        rels_by_shape.setdefault(shape, []).append({"src": src, "tgt": tgt})
+
+    # Schema changes can't share a transaction with data writes, so the
+    # indexes (which turn the relationship MATCHes into lookups) go first.
+    with connector.session() as session:
+        for label in nodes_by_label:
+            session.run(
+                f"CREATE INDEX {label.lower()}_name IF NOT EXISTS FOR (n:{label}) ON (n.name)"
+            ).consume()
+
+    # Wipe + all writes commit together: one transaction, one fsync
+    statements: list[tuple[str, dict | None]] = [("MATCH (n) DETACH DELETE n", None)]
+    for label, rows in nodes_by_label.items():
+        statements.append((
+            f"UNWIND $rows AS row MERGE (n:{label} {{name: row.name}}) SET n += row.props",
+            {"rows": rows},
+        ))
+    for (src_label, rel, tgt_label), rows in rels_by_shape.items():
+        statements.append((
+            f"UNWIND $rows AS row "
+            f"MATCH (a:{src_label} {{name: row.src}}), (b:{tgt_label} {{name: row.tgt}}) "
+            f"MERGE (a)-[:{rel}]->(b)",
+            {"rows": rows},
+        ))
+    connector.execute_write(statements)
     print(f"  {len(NODES)} nodes, {len(RELATIONSHIPS)} relationships\n")
 
 
+def prepare_test(test, extract, classify, engine, gen) -> dict:
+    """
+    Graph-bound half of a test: extraction → intent → traversal → context.
+    Read-only and thread-safe (every query opens its own driver session),
+    so main() runs these concurrently.
+    """
+    query = test[1]
+    entry_nodes = extract(query)
+    intent = classify(query)
+    subgraph = engine.traverse(entry_nodes, intent)
+    return {
+        "entry_nodes": entry_nodes,
+        "intent": intent,
+        "subgraph": subgraph,
+        "context": gen.generate(subgraph),
+    }
+
+
 def run_test(
     desc, query, expected_intent, expected_strategy,
     expected_entry_names, expected_result_names,
-    extractor, classifier, engine, gen, llm=None,
+    prepared, llm=None, limiter=None,
 ) -> bool:
-    print(f"  ── {desc}")
-    print(f"     Query   : \"{query}\"")
+    # Lines are buffered and written once per test (one stdout write, not ~10)
+    log = [f"  ── {desc}", f"     Query   : \"{query}\""]
     errors = []
 
-    entry_nodes = extractor.extract_entry_nodes(query)
-    found_names = {n["name"] for n in entry_nodes}
-    print(f"     Nodes   : {found_names}")
+    entry_nodes = prepared["entry_nodes"]
+    found_names = frozenset(n["name"] for n in entry_nodes)
+    log.append(f"     Nodes   : {set(found_names)}")
 
     if not expected_entry_names.issubset(found_names):
-        errors.append(f"     FAIL entry nodes: expected {expected_entry_names}, got {found_names}")
+        errors.append(f"     FAIL entry nodes: expected {set(expected_entry_names)}, got {set(found_names)}")
 
-    intent = classifier.classify(query)
-    print(f"     Intent  : {intent}")
+    intent = prepared["intent"]
+    log.append(f"     Intent  : {intent}")
     if intent != expected_intent:
         errors.append(f"     FAIL intent: expected '{expected_intent}', got '{intent}'")
 
-    subgraph = engine.traverse(entry_nodes, intent)
+    subgraph = prepared["subgraph"]
     strategy = subgraph.get("strategy", "?")
     hop_depth = subgraph.get("hop_depth", 0)
-    result_names = {n["name"] for n in subgraph["nodes"]}
-    print(f"     Strategy: {strategy}  depth={hop_depth}")
-    print(f"     Results : {result_names}")
+    result_names = frozenset(n["name"] for n in subgraph["nodes"])
+    log.append(f"     Strategy: {strategy}  depth={hop_depth}")
+    log.append(f"     Results : {set(result_names)}")
 
     if strategy != expected_strategy:
         errors.append(f"     FAIL strategy: expected '{expected_strategy}', got '{strategy}'")
 
     if not expected_result_names.issubset(result_names):
         errors.append(
-            f"     FAIL result nodes: expected {expected_result_names} to be in {result_names}"
+            f"     FAIL result nodes: expected {set(expected_result_names)} to be in {set(result_names)}"
         )
 
-    context = gen.generate(subgraph)
+    context = prepared["context"]
 
     if llm:
         for attempt in range(3):
             try:
+                if limiter:
+                    limiter.wait()  # stay under 5 RPM free-tier limit
                 answer = llm.answer(query, context)
                 break
             except Exception as exc:
                 msg = str(exc)
                 if "429" in msg or "RESOURCE_EXHAUSTED" in msg:
-                    wait = 60 if attempt == 0 else 90
-                    print(f"     (rate limited, waiting {wait}s …)")
+                    wait = backoff_delay(exc, attempt)
+                    log.append(f"     (rate limited, waiting {wait:.1f}s …)")
+                    _flush(log)  # show progress before the long wait
                     time.sleep(wait)
                 else:
                     raise
         else:
             answer = "(LLM unavailable after retries)"
         wrapped = "\n     ".join(answer.splitlines())
-        print(f"     LLM     : {wrapped}")
-        time.sleep(13)  # stay under 5 RPM free-tier limit
+        log.append(f"     LLM     : {wrapped}")
 
     if errors:
-        for e in errors:
-            print(e)
-        print("     FAIL ✗")
-        return False
+        log.extend(errors)
+        log.append("     FAIL ✗")
+    else:
+        log.append("     PASS ✓")
+    _flush(log)
+    return not errors
+
 
-    print("     PASS ✓")
-    return True
+def _flush(log: list[str]) -> None:
+    """Write buffered lines in one call and empty the buffer."""
+    if log:
+        sys.stdout.write("\n".join(log) + "\n")
+        log.clear()
 
 
 # ---------------------------------------------------------------------------
@@ -286,7 +359,14 @@ def main() -> None:
     engine     = SmartTraversalEngine(connector, CONFIG_PATH)
     gen        = ContextGenerator(CONFIG_PATH)
 
+    # Both are pure for a fixed, freshly seeded graph: repeated queries (and
+    # the bonus question's entity lookup) are answered from memory. The
+    # engine memoises traversals per (entry ids, intent) on its own.
+    extract  = lru_cache(maxsize=512)(extractor.extract_entry_nodes)
+    classify = lru_cache(maxsize=512)(classifier.classify)
+
     llm = None
+    limiter = RateLimiter(rpm=5)
     key = os.getenv("GEMINI_API_KEY", "")
     if key and key != "your_gemini_api_key_here":
         llm = LLMInterface(api_key=key)
@@ -297,9 +377,15 @@ def main() -> None:
     print("═══ Running complex pipeline tests ══════════════════════════════════")
     passed, failed = 0, 0
 
-    for args in TESTS:
+    # Neo4j work overlaps across tests; only the rate-limited LLM step is serial
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        prepared = list(pool.map(
+            lambda test: prepare_test(test, extract, classify, engine, gen), TESTS
+        ))
+
+    for args, prep in zip(TESTS, prepared):
         print()
-        ok = run_test(*args, extractor, classifier, engine, gen, llm)
+        ok = run_test(*args, prep, llm, limiter)
         if ok:
             passed += 1
         else:
@@ -312,16 +398,16 @@ def main() -> None:
             "A patient takes aspirin for heart disease. "
             "What symptoms might they experience, and what drug interaction risks exist?"
         )
-        entry_nodes  = extractor.extract_entry_nodes(bonus_query)
+        entry_nodes  = extract(bonus_query)
         # Use variable_hop so we get the full 2-hop neighbourhood
         subgraph     = engine.traverse(entry_nodes, "neighborhood")
         context      = gen.generate(subgraph)
         try:
-            time.sleep(13)
+            limiter.wait()
             answer = llm.answer(bonus_query, context)
         except Exception as exc:
             if "429" in str(exc) or "RESOURCE_EXHAUSTED" in str(exc):
-                time.sleep(90)
+                time.sleep(backoff_delay(exc, 0))
                 answer = llm.answer(bonus_query, context)
             else:
                 raise
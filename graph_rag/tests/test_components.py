@@ -14,8 +14,10 @@ import pytest
 from unittest.mock import MagicMock, patch
 
 from intent_classifier import IntentClassifier
-from traversal_engine import SmartTraversalEngine
-from context_generator import ContextGenerator
+
+# SmartTraversalEngine / ContextGenerator are imported inside their fixtures:
+# the engine pulls in the neo4j driver, which `-k` selections of other
+# components should not have to load.
 
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "config", "medical_graph.json")
 
@@ -33,6 +35,18 @@ def make_subgraph(nodes: list[dict], rels: list[dict]) -> dict:
     return {"nodes": nodes, "relationships": rels}
 
 
+class FakeConnector:
+    """Records (cypher, params) per call and returns a canned result."""
+
+    def __init__(self):
+        self.calls: list[tuple[str, dict | None]] = []
+        self.result: list[dict] = []
+
+    def execute_query(self, cypher, params=None):
+        self.calls.append((cypher, params))
+        return self.result
+
+
 def make_traversal_row(
     src_id, src_label, src_name, rel_type, tgt_id, tgt_label, tgt_name
 ) -> dict:
@@ -54,13 +68,20 @@ def make_traversal_row(
 
 class TestIntentClassifier:
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def clf(self):
         return IntentClassifier(CONFIG_PATH)
 
     def test_side_effects_keyword(self, clf):
         assert clf.classify("What are the side effects of aspirin?") == "side_effects"
 
+    def test_mutating_a_loaded_config_does_not_leak(self):
+        from config import load_config
+        load_config(CONFIG_PATH)["intent_patterns"].clear()
+        assert load_config(CONFIG_PATH)["intent_patterns"]
+        clf = IntentClassifier(CONFIG_PATH)
+        assert clf.classify("What are the side effects of aspirin?") == "side_effects"
+
     def test_adverse_keyword(self, clf):
         assert clf.classify("Any adverse reactions to ibuprofen?") == "side_effects"
 
@@ -93,6 +114,44 @@ class TestIntentClassifier:
         assert "interaction" in intents
         assert "symptoms" in intents
 
+    def test_config_order_wins_over_query_position(self, clf):
+        # "side effect" appears first in the query, but shared_effects is
+        # declared before side_effects in the config and must win.
+        assert clf.classify("What side effects do aspirin and ibuprofen share?") == "shared_effects"
+
+    def test_abstract_marker_without_specific_keyword(self, clf):
+        assert clf.classify("Give me a summary of the graph") == "abstract"
+
+    def test_regex_fallback_matches_automaton(self, clf, monkeypatch):
+        import intent_classifier
+        monkeypatch.setattr(intent_classifier, "ahocorasick", None)
+        plain = IntentClassifier(CONFIG_PATH)
+        for q in ("What are the side effects of aspirin?", "What treats headaches?",
+                  "What side effects do aspirin and ibuprofen share?", "Tell me about aspirin"):
+            assert plain.classify(q) == clf.classify(q)
+
+    def test_normalised_repeats_are_memoised(self):
+        fresh = IntentClassifier(CONFIG_PATH)
+        assert fresh.classify("What does aspirin treat?") == "treatment"
+        assert fresh.classify("  WHAT does   aspirin treat? ") == "treatment"
+        info = fresh._classify_cached.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+
+    def test_llm_sees_the_original_query(self):
+        llm = MagicMock()
+        llm.generate_text.return_value = "treatment"
+        fresh = IntentClassifier(CONFIG_PATH, llm=llm)
+        assert fresh.classify("What does  Aspirin treat?") == "treatment"
+        assert 'Query: "What does  Aspirin treat?"' in llm.generate_text.call_args.args[0]
+
+    def test_llm_classification_is_not_memoised(self):
+        llm = MagicMock()
+        llm.generate_text.return_value = "treatment"
+        fresh = IntentClassifier(CONFIG_PATH, llm=llm)
+        fresh.classify("What does aspirin treat?")
+        fresh.classify("What does aspirin treat?")
+        assert llm.generate_text.call_count == 2
+
 
 # ===========================================================================
 # Component 3: SmartTraversalEngine
@@ -102,44 +161,43 @@ class TestSmartTraversalEngine:
 
     @pytest.fixture
     def mock_connector(self):
-        conn = MagicMock()
-        conn.execute_query.return_value = []
-        return conn
+        return FakeConnector()
 
     @pytest.fixture
     def engine(self, mock_connector):
+        from traversal_engine import SmartTraversalEngine
         return SmartTraversalEngine(mock_connector, CONFIG_PATH)
 
     def test_entry_ids_passed_to_query(self, engine, mock_connector):
         entry = [make_node("id:1", "Drug", "Aspirin")]
         engine.traverse(entry, "side_effects")
-        call_params = mock_connector.execute_query.call_args[0][1]
+        call_params = mock_connector.calls[-1][1]
         assert call_params["ids"] == ["id:1"]
 
     def test_source_anchor_uses_source_where(self, engine, mock_connector):
         entry = [make_node("id:1", "Drug", "Aspirin")]
         engine.traverse(entry, "side_effects")
-        cypher = mock_connector.execute_query.call_args[0][0]
+        cypher = mock_connector.calls[-1][0]
         assert "elementId(src) IN $ids" in cypher
 
     def test_target_anchor_uses_target_where(self, engine, mock_connector):
         # "treated_by" uses entry_anchor = "target"
         entry = [make_node("id:2", "Disease", "Headache")]
         engine.traverse(entry, "treated_by")
-        cypher = mock_connector.execute_query.call_args[0][0]
+        cypher = mock_connector.calls[-1][0]
         assert "elementId(tgt) IN $ids" in cypher
 
     def test_either_anchor_uses_or_clause(self, engine, mock_connector):
         # "interaction" uses entry_anchor = "either"
         entry = [make_node("id:1", "Drug", "Aspirin")]
         engine.traverse(entry, "interaction")
-        cypher = mock_connector.execute_query.call_args[0][0]
+        cypher = mock_connector.calls[-1][0]
         assert "OR" in cypher
 
     def test_unknown_intent_falls_back_to_general(self, engine, mock_connector):
         entry = [make_node("id:1", "Drug", "Aspirin")]
         engine.traverse(entry, "general")
-        cypher = mock_connector.execute_query.call_args[0][0]
+        cypher = mock_connector.calls[-1][0]
         assert "MATCH (src)-[r]-(tgt)" in cypher
 
     def test_empty_entry_nodes_returns_empty_subgraph(self, engine):
@@ -149,21 +207,21 @@ class TestSmartTraversalEngine:
         assert result["strategy"] == "none"
 
     def test_subgraph_contains_entry_nodes(self, engine, mock_connector):
-        mock_connector.execute_query.return_value = []
+        mock_connector.result = []
         entry = [make_node("id:99", "Drug", "Metformin")]
         result = engine.traverse(entry, "side_effects")
         ids = [n["id"] for n in result["nodes"]]
         assert "id:99" in ids
 
     def test_subgraph_has_strategy_key(self, engine, mock_connector):
-        mock_connector.execute_query.return_value = []
+        mock_connector.result = []
         entry = [make_node("id:1", "Drug", "Aspirin")]
         result = engine.traverse(entry, "side_effects")
         assert "strategy" in result
         assert result["strategy"] == "targeted"
 
     def test_subgraph_has_hop_depth_key(self, engine, mock_connector):
-        mock_connector.execute_query.return_value = []
+        mock_connector.result = []
         entry = [make_node("id:1", "Drug", "Aspirin")]
         result = engine.traverse(entry, "side_effects")
         assert "hop_depth" in result
@@ -172,7 +230,7 @@ class TestSmartTraversalEngine:
     def test_subgraph_deduplicates_nodes(self, engine, mock_connector):
         row = make_traversal_row("id:1", "Drug", "Aspirin", "CAUSES", "id:2", "SideEffect", "Nausea")
         # Return same row twice
-        mock_connector.execute_query.return_value = [row, row]
+        mock_connector.result = [row, row]
         entry = [make_node("id:1", "Drug", "Aspirin")]
         result = engine.traverse(entry, "side_effects")
         node_ids = [n["id"] for n in result["nodes"]]
@@ -180,22 +238,36 @@ class TestSmartTraversalEngine:
 
     def test_subgraph_relationships_are_captured(self, engine, mock_connector):
         row = make_traversal_row("id:1", "Drug", "Aspirin", "CAUSES", "id:2", "SideEffect", "Nausea")
-        mock_connector.execute_query.return_value = [row]
+        mock_connector.result = [row]
         entry = [make_node("id:1", "Drug", "Aspirin")]
         result = engine.traverse(entry, "side_effects")
         assert len(result["relationships"]) == 1
         assert result["relationships"][0]["type"] == "CAUSES"
 
+    def test_cypher_reused_across_calls(self, engine, mock_connector):
+        engine.traverse([make_node("id:1", "Drug", "Aspirin")], "side_effects")
+        engine.traverse([make_node("id:9", "Drug", "Ibuprofen")], "side_effects")
+        first, second = mock_connector.calls[-2:]
+        assert first[0] is second[0]
+        assert second[1] == {"ids": ["id:9"]}
+
+    def test_duplicate_relationships_collapsed(self, engine, mock_connector):
+        row = make_traversal_row("id:1", "Drug", "Aspirin", "CAUSES", "id:2", "SideEffect", "Nausea")
+        mock_connector.result = [row, dict(row)]
+        entry = [make_node("id:1", "Drug", "Aspirin")]
+        result = engine.traverse(entry, "side_effects")
+        assert len(result["relationships"]) == 1
+
     def test_correct_relationship_type_in_cypher(self, engine, mock_connector):
         entry = [make_node("id:1", "Drug", "Aspirin")]
         engine.traverse(entry, "side_effects")
-        cypher = mock_connector.execute_query.call_args[0][0]
+        cypher = mock_connector.calls[-1][0]
         assert "CAUSES" in cypher
 
     def test_correct_labels_in_cypher_for_treatment(self, engine, mock_connector):
         entry = [make_node("id:1", "Drug", "Aspirin")]
         engine.traverse(entry, "treatment")
-        cypher = mock_connector.execute_query.call_args[0][0]
+        cypher = mock_connector.calls[-1][0]
         assert "Drug" in cypher
         assert "Disease" in cypher
         assert "TREATS" in cypher
@@ -207,8 +279,9 @@ class TestSmartTraversalEngine:
 
 class TestContextGenerator:
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def gen(self):
+        from context_generator import ContextGenerator
         return ContextGenerator(CONFIG_PATH)
 
     def test_context_header_shows_strategy(self, gen):
@@ -291,3 +364,23 @@ class TestLLMInterfaceGuards:
         from llm_interface import LLMInterface
         with pytest.raises(ValueError):
             LLMInterface(api_key="your_gemini_api_key_here")
+
+    def test_retry_delay_parsed_from_error(self):
+        from llm_interface import retry_delay_seconds
+        err = Exception("429 RESOURCE_EXHAUSTED. {'retryDelay': '23s'}")
+        assert retry_delay_seconds(err) == 23.0
+        assert retry_delay_seconds(Exception("Please retry in 4.5s.")) == 4.5
+        assert retry_delay_seconds(Exception("429 RESOURCE_EXHAUSTED")) is None
+
+    def test_answer_config_built_once(self):
+        """Every answer() reuses one inline system-prompt config."""
+        import llm_interface
+        with patch.object(llm_interface.genai, "Client") as client_cls:
+            client = client_cls.return_value
+            client.models.generate_content.return_value = MagicMock(text=" ok ")
+            llm = llm_interface.LLMInterface(api_key="test-key")
+            assert llm.answer("q", "ctx") == "ok"
+            assert llm.answer("q", "ctx") == "ok"
+        first, second = (c.kwargs["config"] for c in client.models.generate_content.call_args_list)
+        assert first is second
+        assert first.system_instruction == llm_interface._SYSTEM_PROMPT
@@ -42,7 +42,9 @@ def mock_connector():
 
 @pytest.fixture
 def extractor(mock_connector):
-    return QueryTimeEntityExtractor(mock_connector)
+    ext = QueryTimeEntityExtractor(mock_connector)
+    ext.refresh_name_index()  # empty graph: prefilter loaded but disabled
+    return ext
 
 
 # ---------------------------------------------------------------------------
@@ -89,32 +91,43 @@ class TestExtractKeywords:
 
 
 # ---------------------------------------------------------------------------
-# _exact_match / _partial_match tests
+# _batch_match tests
 # ---------------------------------------------------------------------------
 
 class TestGraphLookup:
-    def test_exact_match_hit(self, extractor, mock_connector):
+    def test_hit_returns_node_dicts(self, extractor, mock_connector):
         """Connector returns one row → one node dict back."""
         mock_connector.execute_query.return_value = [
-            {"id": "4:abc:1", "label": "Drug", "properties": {"name": "Aspirin"}}
+            {"matched_kw": "aspirin", "id": "4:abc:1", "label": "Drug",
+             "properties": {"name": "Aspirin"}, "tier": 0}
         ]
-        nodes = extractor._exact_match("aspirin")
-        assert len(nodes) == 1
+        tier, nodes = extractor._batch_match(["aspirin"])["aspirin"]
+        assert tier == 0
         assert nodes[0]["name"] == "Aspirin"
         assert nodes[0]["label"] == "Drug"
 
-    def test_exact_match_miss_returns_empty(self, extractor, mock_connector):
+    def test_miss_returns_nothing(self, extractor, mock_connector):
         mock_connector.execute_query.return_value = []
-        nodes = extractor._exact_match("nonexistentdrug")
-        assert nodes == []
+        assert extractor._batch_match(["nonexistentdrug"]).get("nonexistentdrug") is None
 
-    def test_partial_match_returns_results(self, extractor, mock_connector):
+    def test_prefers_exact_tier(self, extractor, mock_connector):
+        """Exact (tier 0) rows win; partial (tier 1) rows are dropped."""
         mock_connector.execute_query.return_value = [
-            {"id": "4:abc:2", "label": "Drug", "properties": {"name": "Ibuprofen"}}
+            {"matched_kw": "aspirin", "id": "4:abc:1", "label": "Drug",
+             "properties": {"name": "Aspirin"}, "tier": 0},
+            {"matched_kw": "aspirin", "id": "4:abc:3", "label": "Drug",
+             "properties": {"name": "Aspirin Plus"}, "tier": 1},
         ]
-        nodes = extractor._partial_match("ibu")
-        assert len(nodes) == 1
-        assert nodes[0]["name"] == "Ibuprofen"
+        tier, nodes = extractor._batch_match(["aspirin"])["aspirin"]
+        assert (tier, [n["name"] for n in nodes]) == (0, ["Aspirin"])
+
+    def test_falls_back_to_partial_tier(self, extractor, mock_connector):
+        mock_connector.execute_query.return_value = [
+            {"matched_kw": "ibu", "id": "4:abc:2", "label": "Drug",
+             "properties": {"name": "Ibuprofen"}, "tier": 1},
+        ]
+        tier, nodes = extractor._batch_match(["ibu"])["ibu"]
+        assert (tier, [n["name"] for n in nodes]) == (1, ["Ibuprofen"])
 
 
 # ---------------------------------------------------------------------------
@@ -130,11 +143,12 @@ class TestExtractEntryNodes:
         }
 
         def side_effect(cypher, params):
-            # Only return a result when the keyword matches "aspirin"
-            keyword = params.get("keyword", "")
-            if "aspirin" in keyword:
-                return [aspirin_row]
-            return []
+            # Batched lookup: one row per keyword that matches "aspirin"
+            return [
+                {**aspirin_row, "matched_kw": kw, "tier": 0 if kw == "aspirin" else 1}
+                for kw in params.get("keywords", [])
+                if "aspirin" in kw
+            ]
 
         mock_connector.execute_query.side_effect = side_effect
 
@@ -142,6 +156,44 @@ class TestExtractEntryNodes:
         assert len(nodes) == 1
         assert nodes[0]["name"] == "Aspirin"
 
+    def test_all_candidates_sent_in_one_batch(self, extractor, mock_connector):
+        """Every n-gram candidate goes out in a single UNWIND query."""
+        mock_connector.execute_query.return_value = [
+            {"matched_kw": kw, "id": f"4:abc:{i}", "label": "Drug",
+             "properties": {"name": kw.title()}, "tier": 0}
+            for i, kw in enumerate(["aspirin", "warfarin"])
+        ]
+        mock_connector.execute_query.reset_mock()
+        extractor.extract_entry_nodes("aspirin warfarin")
+        first_call = mock_connector.execute_query.call_args_list[0]
+        assert "UNWIND $keywords" in first_call.args[0]
+        assert first_call.args[1]["keywords"] == ["aspirin warfarin", "aspirin", "warfarin"]
+
+    def test_fallback_results_keep_candidate_order(self, extractor, mock_connector):
+        """Concurrent fuzzy/semantic fallbacks are merged in n-gram order."""
+        mock_connector.execute_query.return_value = []
+        fallback_nodes = {
+            kw: [{"id": kw, "label": "Drug", "name": kw, "properties": {}}]
+            for kw in ("asprin warfrin", "asprin", "warfrin")
+        }
+        with patch.object(extractor, "_fallback_match",
+                          side_effect=lambda kw, fuzzy=True: fallback_nodes[kw]):
+            nodes = extractor._lookup_candidates(["asprin warfrin", "asprin", "warfrin"])
+        assert [n["id"] for n in nodes] == ["asprin warfrin", "asprin", "warfrin"]
+
+    def test_exact_phrase_consumes_sub_grams(self, extractor, mock_connector):
+        """An exact multi-word hit suppresses lookups of its component words."""
+        mock_connector.execute_query.return_value = [
+            {"matched_kw": "stomach bleeding", "id": "4:abc:1", "label": "Symptom",
+             "properties": {"name": "Stomach Bleeding"}, "tier": 0},
+            {"matched_kw": "stomach", "id": "4:abc:2", "label": "Organ",
+             "properties": {"name": "Stomach"}, "tier": 0},
+        ]
+        with patch.object(extractor, "_fallback_match", return_value=[]) as fallback:
+            nodes = extractor._lookup_candidates(["stomach bleeding", "stomach", "bleeding"])
+        assert [n["name"] for n in nodes] == ["Stomach Bleeding"]
+        fallback.assert_not_called()
+
     def test_no_entity_returns_empty(self, extractor, mock_connector):
         mock_connector.run_query.return_value = []
         nodes = extractor.extract_entry_nodes("Tell me something interesting")
@@ -164,12 +216,15 @@ class TestExtractEntryNodes:
     def test_multi_entity_query(self, extractor, mock_connector):
         """'aspirin' and 'warfarin' should each find their node."""
         def side_effect(cypher, params):
-            keyword = params.get("keyword", "")
-            if "aspirin" in keyword:
-                return [{"id": "4:abc:1", "label": "Drug", "properties": {"name": "Aspirin"}}]
-            if "warfarin" in keyword:
-                return [{"id": "4:abc:2", "label": "Drug", "properties": {"name": "Warfarin"}}]
-            return []
+            rows = []
+            for kw in params.get("keywords", []):
+                if "aspirin" in kw:
+                    rows.append({"matched_kw": kw, "id": "4:abc:1", "label": "Drug",
+                                 "properties": {"name": "Aspirin"}})
+                if "warfarin" in kw:
+                    rows.append({"matched_kw": kw, "id": "4:abc:2", "label": "Drug",
+                                 "properties": {"name": "Warfarin"}})
+            return rows
 
         mock_connector.execute_query.side_effect = side_effect
         nodes = extractor.extract_entry_nodes("Can I take aspirin with warfarin?")
@@ -186,13 +241,116 @@ class TestExtractEntryNodes:
         assert nodes == []
 
 
+# ---------------------------------------------------------------------------
+# Trigram prefilter
+# ---------------------------------------------------------------------------
+
+class TestNamePrefilter:
+    @pytest.fixture
+    def indexed(self, mock_connector):
+        mock_connector.execute_query.return_value = [{"name": "aspirin"}, {"name": "stomach bleeding"}]
+        ext = QueryTimeEntityExtractor(mock_connector)
+        ext.refresh_name_index()
+        mock_connector.execute_query.reset_mock()
+        mock_connector.execute_query.return_value = []
+        return ext
+
+    def test_index_loads_lazily(self, mock_connector):
+        QueryTimeEntityExtractor(mock_connector)
+        mock_connector.execute_query.assert_not_called()
+
+    def test_keyword_without_shared_trigram_is_rejected(self, indexed):
+        assert not indexed._may_exist("xyzzy")
+        assert indexed._may_exist("aspirin")
+        assert indexed._may_exist("bleed")
+
+    def test_rejected_candidates_never_reach_the_graph(self, indexed, mock_connector):
+        indexed.extract_entry_nodes("xyzzy quux")
+        assert mock_connector.execute_query.call_count == 0
+
+    def test_empty_index_disables_prefilter(self, extractor):
+        assert extractor._may_exist("xyzzy")
+
+    def test_rejected_candidates_still_reach_semantic_search(self, indexed):
+        indexed.llm = MagicMock()
+        with patch.object(indexed, "_semantic_search", return_value=[]) as semantic:
+            indexed._lookup_candidates(["painkiller"])
+        semantic.assert_called_once_with("painkiller")
+
+    def test_invalidate_reloads_index(self, indexed, mock_connector):
+        indexed.invalidate()
+        mock_connector.execute_query.return_value = [{"name": "xyzzy"}]
+        assert indexed._may_exist("xyzzy")
+
+    def test_index_reloads_after_ttl(self, indexed, mock_connector, monkeypatch):
+        import entity_extractor
+        mock_connector.execute_query.return_value = [{"name": "xyzzy"}]
+        assert not indexed._may_exist("xyzzy")
+        expired = indexed._name_index_expires + 1
+        monkeypatch.setattr(entity_extractor.time, "monotonic", lambda: expired)
+        assert indexed._may_exist("xyzzy")
+
+
+# ---------------------------------------------------------------------------
+# Lookup cache
+# ---------------------------------------------------------------------------
+
+class TestLookupCache:
+    ROWS = [{"matched_kw": "aspirin", "id": "4:abc:1", "label": "Drug",
+             "properties": {"name": "Aspirin"}, "tier": 0}]
+
+    def test_repeated_keywords_skip_the_graph(self, extractor, mock_connector):
+        mock_connector.execute_query.return_value = self.ROWS
+        first = extractor._batch_match(["aspirin", "zzz"])
+        mock_connector.execute_query.reset_mock()
+        assert extractor._batch_match(["Aspirin", "zzz"]) == first
+        mock_connector.execute_query.assert_not_called()
+        assert extractor.cache_stats()["lookup_hits"] == 2
+
+    def test_only_uncached_keywords_are_sent(self, extractor, mock_connector):
+        mock_connector.execute_query.return_value = self.ROWS
+        extractor._batch_match(["aspirin"])
+        extractor._batch_match(["aspirin", "warfarin"])
+        assert mock_connector.execute_query.call_args.args[1]["keywords"] == ["warfarin"]
+
+    def test_zero_ttl_disables_cache(self, mock_connector):
+        ext = QueryTimeEntityExtractor(mock_connector, cache_ttl=0)
+        mock_connector.execute_query.return_value = self.ROWS
+        mock_connector.execute_query.reset_mock()
+        ext._batch_match(["aspirin"])
+        ext._batch_match(["aspirin"])
+        assert mock_connector.execute_query.call_count == 2
+
+    def test_clear_cache_forces_refetch(self, extractor, mock_connector):
+        mock_connector.execute_query.return_value = self.ROWS
+        extractor._batch_match(["aspirin"])
+        extractor.clear_cache()
+        mock_connector.execute_query.reset_mock()
+        extractor._batch_match(["aspirin"])
+        mock_connector.execute_query.assert_called_once()
+
+    def test_batch_extraction_shares_one_lookup(self, mock_connector):
+        ext = QueryTimeEntityExtractor(mock_connector, cache_ttl=0)
+        mock_connector.execute_query.return_value = self.ROWS
+        mock_connector.execute_query.reset_mock()
+        found = ext.extract_entry_nodes_batch(
+            ["side effects of aspirin", "is aspirin safe", "aspirin dosage"]
+        )
+        # Exact/partial lookups: one round-trip for all three queries
+        batched = [c for c in mock_connector.execute_query.call_args_list
+                   if len(c.args) > 1 and "keywords" in (c.args[1] or {})]
+        assert len(batched) == 1
+        assert all(nodes[0]["id"] == "4:abc:1" for nodes in found.values())
+        assert len(found) == 3
+
+
 # ---------------------------------------------------------------------------
 # Configuration options
 # ---------------------------------------------------------------------------
 
 class TestConfiguration:
     def test_custom_search_properties(self, mock_connector):
-        """Extractor should use custom search_properties in its Cypher."""
+        """Extractor should search custom search_properties (passed as $props)."""
         ext = QueryTimeEntityExtractor(
             mock_connector,
             search_properties=["name", "generic_name", "brand_name"],
@@ -200,12 +358,15 @@ class TestConfiguration:
         mock_connector.execute_query.return_value = []
         ext.extract_entry_nodes("tylenol")
 
-        # Verify all three properties appear in at least one Cypher call
-        all_cyphers = " ".join(
-            str(call.args[0]) for call in mock_connector.execute_query.call_args_list
-        )
-        assert "generic_name" in all_cyphers
-        assert "brand_name" in all_cyphers
+        # Verify all three properties are searched in at least one call
+        all_props = [
+            prop
+            for call in mock_connector.execute_query.call_args_list
+            if len(call.args) > 1 and call.args[1]
+            for prop in call.args[1].get("props", [])
+        ]
+        assert "generic_name" in all_props
+        assert "brand_name" in all_props
 
     def test_label_restriction(self, mock_connector):
         """With node_labels set, Cypher should include a label filter."""
@@ -219,7 +380,52 @@ class TestConfiguration:
         all_cyphers = " ".join(
             str(call.args[0]) for call in mock_connector.execute_query.call_args_list
         )
-        assert "Drug|Disease" in all_cyphers
+        assert "`Drug`|`Disease`" in all_cyphers
+
+    def test_ensure_indexes_uses_configured_labels(self, mock_connector):
+        ext = QueryTimeEntityExtractor(mock_connector, node_labels=["Drug"])
+        ext.ensure_indexes()
+        cyphers = " ".join(str(c.args[0]) for c in mock_connector.execute_query.call_args_list)
+        mock_connector.ensure_fulltext_index.assert_called_once_with(
+            "entity_names", ["Drug"], ["name"]
+        )
+        assert "db.labels" not in cyphers
+
+    def test_ensure_indexes_leaves_lookups_unfiltered(self, mock_connector):
+        ext = QueryTimeEntityExtractor(mock_connector)
+        mock_connector.execute_query.return_value = [{"label": "Drug"}]
+        ext.ensure_indexes()
+        assert ext.node_labels is None
+        assert "MATCH (n)" in ext._batch_cypher
+
+    def test_label_filter_quotes_labels(self, mock_connector):
+        ext = QueryTimeEntityExtractor(mock_connector, node_labels=["Side Effect"])
+        assert "(n:`Side Effect`)" in ext._batch_cypher
+
+    def test_lookup_reads_raw_property(self, mock_connector):
+        ext = QueryTimeEntityExtractor(mock_connector, node_labels=["Drug"])
+        ext._batch_match(["aspirin"])
+        cypher, params = mock_connector.execute_query.call_args.args
+        assert "[p IN $props | toLower(n[p])]" in cypher
+        assert params["props"] == ["name"]
+
+    def test_returns_only_projected_properties(self, mock_connector):
+        ext = QueryTimeEntityExtractor(
+            mock_connector, search_properties=["name", "brand_name"],
+        )
+        ext._batch_match(["aspirin"])
+        cypher = mock_connector.execute_query.call_args.args[0]
+        assert "properties: n{.`name`, .`brand_name`}" in cypher
+        assert "properties(n)" not in cypher
+
+    def test_lookup_cypher_is_stable_across_calls(self, extractor, mock_connector):
+        """Only parameters vary between lookups, so the server reuses one plan."""
+        mock_connector.execute_query.return_value = []
+        extractor._batch_match(["aspirin"])
+        extractor._batch_match(["ibuprofen"])
+        first, second = mock_connector.execute_query.call_args_list[-2:]
+        assert first.args[0] is second.args[0]
+        assert first.args[1]["keywords"] != second.args[1]["keywords"]
 
     def test_extra_stop_words(self, mock_connector):
         """Words added via extra_stop_words must be excluded from keywords."""
@@ -231,3 +437,99 @@ class TestConfiguration:
         assert "drug" not in keywords
         assert "medication" not in keywords
         assert "aspirin" in keywords
+
+
+# ---------------------------------------------------------------------------
+# Fuzzy fallback
+# ---------------------------------------------------------------------------
+
+class TestFuzzyMatch:
+    @pytest.fixture(params=["rapidfuzz", "levenshtein"])
+    def client_extractor(self, request, mock_connector):
+        pytest.importorskip("rapidfuzz" if request.param == "rapidfuzz" else "Levenshtein")
+        ext = QueryTimeEntityExtractor(mock_connector)
+        ext._fuzzy_backend = request.param
+        return ext
+
+    @staticmethod
+    def _serve_graph(mock_connector, names):
+        """Skinny rows for the streamed prefilter; full rows for the id fetch."""
+        nodes = {f"4:abc:{i}": make_node(f"4:abc:{i}", "Drug", n) for i, n in enumerate(names)}
+        mock_connector.stream_query.return_value = iter(
+            {"id": i, "candidate_name": row["candidate_name"]} for i, row in nodes.items()
+        )
+
+        def fetch(cypher, params):
+            if "apoc." in cypher:
+                raise Exception("Unknown function 'apoc.text.levenshteinSimilarity'")
+            return [nodes[i] for i in params["ids"]]
+
+        mock_connector.execute_query.side_effect = fetch
+
+    def test_streams_and_keeps_best_five(self, client_extractor, mock_connector):
+        extractor = client_extractor
+        extractor._apoc_available = False   # force client-side scoring
+        names = ["aspirin", "aspirn", "asprin", "aspirine", "aspiring", "aspir1n", "zzzzzzz"]
+        self._serve_graph(mock_connector, names)
+        nodes = extractor._fuzzy_match("aspirin")
+        assert nodes[0]["name"] == "aspirin"
+        assert len(nodes) <= 5
+        assert "zzzzzzz" not in {n["name"] for n in nodes}
+
+    def test_prefilter_is_skinny(self, client_extractor, mock_connector):
+        """Only the winners' full properties are fetched, in one call."""
+        extractor = client_extractor
+        extractor._apoc_available = False
+        self._serve_graph(mock_connector, ["aspirin", "zzzzzzz"])
+        extractor._fuzzy_match("asprin")
+        prefilter = mock_connector.stream_query.call_args.args[0]
+        assert "properties(n)" not in prefilter
+        cypher, params = mock_connector.execute_query.call_args.args
+        assert "elementId(n) IN $ids" in cypher
+        assert params["ids"] == ["4:abc:0"]
+
+    def test_fulltext_index_supplies_candidates(self, client_extractor, mock_connector):
+        extractor = client_extractor
+        extractor.ensure_indexes()
+        extractor._apoc_available = False
+        self._serve_graph(mock_connector, ["aspirin"])
+        nodes = extractor._fuzzy_match("asprin")
+        cypher, params = mock_connector.stream_query.call_args.args
+        assert "db.index.fulltext.queryNodes" in cypher
+        assert params["terms"] == "asprin~"
+        assert [n["name"] for n in nodes] == ["aspirin"]
+
+    def test_apoc_scoring_is_server_side(self, extractor, mock_connector):
+        mock_connector.execute_query.return_value = [
+            {"id": "4:abc:1", "label": "Drug", "properties": {"name": "Aspirin"}, "sim": 0.9}
+        ]
+        nodes = extractor._fuzzy_match("asprin")
+        cypher, params = mock_connector.execute_query.call_args.args
+        assert "apoc.text.levenshteinSimilarity" in cypher
+        assert params["threshold"] == extractor.fuzzy_threshold
+        assert [n["name"] for n in nodes] == ["Aspirin"]
+        mock_connector.stream_query.assert_not_called()
+
+    def test_apoc_scores_all_keywords_in_one_query(self, extractor, mock_connector):
+        def side_effect(cypher, params):
+            return [
+                {"matched_kw": r["key"], "id": f"4:abc:{i}", "label": "Drug",
+                 "properties": {"name": r["kw"].replace("asprin", "aspirin")}}
+                for i, r in enumerate(params.get("rows", []))
+                if r["kw"] == "asprin"
+            ]
+
+        mock_connector.execute_query.side_effect = side_effect
+        mock_connector.execute_query.reset_mock()
+        found = extractor._fallback_many(["asprin", "warfrin"])
+        assert [n["name"] for n in found["asprin"]] == ["aspirin"]
+        assert found["warfrin"] == []
+        cyphers = [c.args[0] for c in mock_connector.execute_query.call_args_list]
+        assert len(cyphers) == 1 and "UNWIND $rows" in cyphers[0]
+
+    def test_falls_back_to_client_when_apoc_missing(self, client_extractor, mock_connector):
+        extractor = client_extractor
+        self._serve_graph(mock_connector, ["aspirin"])
+        nodes = extractor._fuzzy_match("asprin")
+        assert [n["name"] for n in nodes] == ["aspirin"]
+        assert extractor._apoc_available is False
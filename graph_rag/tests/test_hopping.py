@@ -14,7 +14,7 @@ import pytest
 from unittest.mock import MagicMock
 
 from intent_classifier import IntentClassifier
-from traversal_engine import SmartTraversalEngine
+from traversal_engine import SmartTraversalEngine, subgraph_columns
 
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "config", "medical_graph.json")
 
@@ -224,12 +224,15 @@ class TestShortestPathStrategy:
         assert "shortestPath" in cypher
 
     def test_cypher_pairs_ids_lexicographically(self, engine, mock_connector):
-        """Both entry-node IDs must appear in the WHERE clause."""
-        entry = [make_node("id:1", "Drug", "Aspirin"),
-                 make_node("id:2", "Drug", "Warfarin")]
+        """Entry-node IDs are bound as sorted, de-duplicated $pairs."""
+        entry = [make_node("id:3", "Drug", "Aspirin"),
+                 make_node("id:1", "Drug", "Warfarin"),
+                 make_node("id:2", "Drug", "Ibuprofen"),
+                 make_node("id:1", "Drug", "Warfarin")]
         engine.traverse(entry, "connection")
-        cypher = mock_connector.execute_query.call_args[0][0]
-        assert "$ids" in cypher
+        cypher, params = mock_connector.execute_query.call_args[0]
+        assert "UNWIND $pairs" in cypher
+        assert params["pairs"] == [("id:1", "id:2"), ("id:1", "id:3"), ("id:2", "id:3")]
 
     def test_single_entry_falls_back_to_variable_hop(self, engine, mock_connector):
         """When only one entry node exists, shortest_path degrades to variable_hop."""
@@ -280,6 +283,14 @@ class TestSharedNeighborStrategy:
         assert "min_conn" in cypher
         assert "connected_entries" in cypher
 
+    def test_cypher_expands_entries_once(self, engine, mock_connector):
+        entry = [make_node("id:1", "Drug", "Aspirin"),
+                 make_node("id:2", "Drug", "Ibuprofen")]
+        engine.traverse(entry, "shared_effects")
+        cypher = mock_connector.execute_query.call_args[0][0]
+        assert cypher.count("MATCH") == 1
+        assert "UNWIND edges" in cypher
+
     def test_shared_neighbor_in_subgraph(self, engine, mock_connector):
         # Both aspirin and ibuprofen CAUSE Nausea — Nausea should appear
         row1 = make_row("id:1", "Drug", "Aspirin",    "CAUSES", "id:10", "SideEffect", "Nausea")
@@ -321,6 +332,102 @@ class TestGeneralStrategy:
         assert "(src)-[r]-(tgt)" in cypher
 
 
+# ===========================================================================
+# Aggregated path results
+# ===========================================================================
+
+class TestAggregatedPathRows:
+
+    def test_path_strategies_aggregate_server_side(self, engine, mock_connector):
+        engine.traverse([make_node("id:1", "Drug", "Aspirin")], "neighborhood")
+        cypher = mock_connector.execute_query.call_args[0][0]
+        assert "collect(DISTINCT" in cypher
+        assert "AS edges" in cypher
+
+    def test_aggregated_row_decodes_like_flat_rows(self, engine, mock_connector):
+        flat = [
+            make_row("id:1", "Drug", "Metformin", "TREATS", "id:2", "Disease", "Diabetes"),
+            make_row("id:2", "Disease", "Diabetes", "HAS_SYMPTOM", "id:3", "Symptom", "Fatigue"),
+        ]
+        aggregated = [{
+            "edges": [
+                {"source_id": r["source_id"], "rel_type": r["rel_type"],
+                 "rel_props": r["rel_props"], "target_id": r["target_id"]}
+                for r in flat
+            ],
+            "nodes": [
+                {"id": "id:1", "label": "Drug",    "properties": {"name": "Metformin"}},
+                {"id": "id:2", "label": "Disease", "properties": {"name": "Diabetes"}},
+                {"id": "id:3", "label": "Symptom", "properties": {"name": "Fatigue"}},
+            ],
+        }]
+        entry = [make_node("id:1", "Drug", "Metformin")]
+        assert engine._build_subgraph(aggregated, entry) == engine._build_subgraph(flat, entry)
+
+
+# ===========================================================================
+# Traversal memoisation
+# ===========================================================================
+
+class TestTraversalCache:
+
+    def test_repeat_is_served_from_cache(self, engine, mock_connector):
+        entry = [make_node("id:1", "Drug", "Aspirin"), make_node("id:2", "Drug", "Ibuprofen")]
+        first = engine.traverse(entry, "shared_effects")
+        second = engine.traverse(list(reversed(entry)), "shared_effects")
+        assert mock_connector.execute_query.call_count == 1
+        assert second == first and second["nodes"] is not first["nodes"]
+
+    def test_invalidate_forces_requery(self, engine, mock_connector):
+        entry = [make_node("id:1", "Drug", "Aspirin")]
+        engine.traverse(entry, "neighborhood")
+        engine.invalidate()
+        engine.traverse(entry, "neighborhood")
+        assert mock_connector.execute_query.call_count == 2
+
+    def test_expired_entries_are_requeried(self, engine, mock_connector, monkeypatch):
+        import traversal_engine
+        clock = [1000.0]
+        monkeypatch.setattr(traversal_engine.time, "monotonic", lambda: clock[0])
+        entry = [make_node("id:1", "Drug", "Aspirin")]
+        engine.traverse(entry, "neighborhood")
+        clock[0] += traversal_engine._TRAVERSE_CACHE_TTL + 1
+        engine.traverse(entry, "neighborhood")
+        assert mock_connector.execute_query.call_count == 2
+
+    def test_zero_cache_size_disables_cache(self, mock_connector):
+        engine = SmartTraversalEngine(mock_connector, CONFIG_PATH, cache_size=0)
+        entry = [make_node("id:1", "Drug", "Aspirin")]
+        engine.traverse(entry, "neighborhood")
+        engine.traverse(entry, "neighborhood")
+        assert mock_connector.execute_query.call_count == 2
+
+
+# ===========================================================================
+# Plan warm-up
+# ===========================================================================
+
+class TestPreflight:
+
+    def test_explains_every_template_without_executing(self, engine, mock_connector):
+        assert engine.preflight() == []
+        queries = [c.args[0] for c in mock_connector.execute_read.call_args_list]
+        assert queries and all(q.startswith("EXPLAIN ") for q in queries)
+        mock_connector.execute_query.assert_not_called()
+
+    def test_planner_errors_are_reported_not_raised(self, engine, mock_connector):
+        from neo4j.exceptions import ClientError
+        mock_connector.execute_read.side_effect = ClientError("syntax error")
+        failed = engine.preflight()
+        assert "general" in failed and "shared_effects" in failed
+
+    def test_connection_errors_propagate(self, engine, mock_connector):
+        mock_connector.execute_read.side_effect = ConnectionError("unreachable")
+        with pytest.raises(ConnectionError):
+            engine.preflight()
+        assert mock_connector.execute_read.call_count == 1
+
+
 # ===========================================================================
 # Cross-strategy: subgraph structure invariants
 # All strategies must produce the same output shape
@@ -363,3 +470,22 @@ class TestSubgraphInvariants:
         result_ids = {n["id"] for n in result["nodes"]}
         for en in entry:
             assert en["id"] in result_ids
+
+    def test_traverse_many_matches_traverse(self, engine, mock_connector):
+        entry = [make_node("id:1", "Drug", "Aspirin"),
+                 make_node("id:2", "Drug", "Ibuprofen")]
+        intents = ["side_effects", "connection", "shared_effects", "connection"]
+        results = engine.traverse_many(entry, intents)
+        assert list(results) == ["side_effects", "connection", "shared_effects"]
+        for intent, result in results.items():
+            assert result["strategy"] == engine.traverse(entry, intent)["strategy"]
+
+    def test_columns_parallel_nodes_and_relationships(self, engine, mock_connector):
+        mock_connector.execute_query.return_value = [
+            make_row("id:1", "Drug", "Aspirin", "CAUSES", "id:10", "SideEffect", "Nausea"),
+        ]
+        result = engine.traverse([make_node("id:1", "Drug", "Aspirin")], "side_effects")
+        cols = subgraph_columns(result)
+        assert cols["node_ids"] == [n["id"] for n in result["nodes"]]
+        assert cols["node_names"] == ["Aspirin", "Nausea"]
+        assert (cols["rel_srcs"], cols["rel_tgts"], cols["rel_types"]) == (["id:1"], ["id:10"], ["CAUSES"])
@@ -64,24 +64,24 @@ SAMPLE_RELS = [
 
 def seed_graph(connector: GraphDBConnector) -> None:
     print("\n── Seeding knowledge graph ──────────────────────────────────────────")
-    connector.execute_query("MATCH (n) DETACH DELETE n")
-    print(f"  Cleared existing data")
-
+    # execute_query is read-only; writes go through one write transaction
+    statements: list[tuple[str, dict | None]] = [("MATCH (n) DETACH DELETE n", None)]
     for name, label, props in SAMPLE_NODES:
-        connector.execute_query(
+        statements.append((
             f"MERGE (n:{label} {{name: $name}}) SET n += $props",
             {"name": name, "props": props},
-        )
-    print(f"  Created {len(SAMPLE_NODES)} nodes")
-
+        ))
     for src, rel, tgt in SAMPLE_RELS:
-        connector.execute_query(
+        statements.append((
             f"""
             MATCH (a {{name: $src}}), (b {{name: $tgt}})
             MERGE (a)-[:{rel}]->(b)
             """,
             {"src": src, "tgt": tgt},
-        )
+        ))
+    connector.execute_write(statements)
+    print(f"  Cleared existing data")
+    print(f"  Created {len(SAMPLE_NODES)} nodes")
     print(f"  Created {len(SAMPLE_RELS)} relationships")
 
 
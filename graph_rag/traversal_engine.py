@@ -23,23 +23,32 @@ Subgraph format (returned by every strategy)
     "strategy":      str,   # which strategy was used
     "hop_depth":     int,   # maximum graph distance traversed
 }
+
+subgraph_columns() gives the same data column-wise (node_ids, rel_types, …)
+for consumers that only need one field.
 """
 
-import json
-from .connector import GraphDBConnector
+import logging
+import operator
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+
+from neo4j.exceptions import ClientError
 
+from .config import load_config
+from .connector import GraphDBConnector
 
-def _load_config(config_path_or_dict) -> dict:
-    """Accept a file path (str) or a config dict directly."""
-    if isinstance(config_path_or_dict, dict):
-        return config_path_or_dict
-    with open(config_path_or_dict) as f:
-        return json.load(f)
+logger = logging.getLogger(__name__)
 
 
 # ---------------------------------------------------------------------------
-# Shared RETURN clause used by single-edge queries and path UNWIND queries.
-# All strategies produce rows conforming to this shape.
+# RETURN clause of the single-edge strategies (targeted, general); the
+# shared_neighbor query returns the same columns. Path strategies use
+# _EDGE_RETURN_AGG below, which _build_subgraph decodes to the same shape.
 # ---------------------------------------------------------------------------
 _EDGE_RETURN = """
     RETURN DISTINCT
@@ -53,6 +62,35 @@ _EDGE_RETURN = """
         properties(tgt)  AS target_props
 """
 
+# Aggregated variant for the path strategies, whose per-edge rows repeat
+# every node's properties once per incident edge (and per containing path).
+# Returns ONE row: distinct edges (ids + type + props) and distinct nodes,
+# each node's properties sent once. Caller aliases src/r/tgt as above.
+_EDGE_RETURN_AGG = """
+    WITH collect(DISTINCT {
+             source_id: elementId(src), rel_type: type(r),
+             rel_props: properties(r),  target_id: elementId(tgt)
+         }) AS edges,
+         collect(DISTINCT src) + collect(DISTINCT tgt) AS ends
+    UNWIND ends AS n
+    WITH edges, collect(DISTINCT n) AS uniq
+    RETURN edges,
+           [n IN uniq | {id: elementId(n), label: labels(n)[0], properties: properties(n)}] AS nodes
+"""
+
+# Unpacks one result row (shape above) in a single C-level call.
+_ROW_FIELDS = operator.itemgetter(
+    "source_id", "source_label", "source_props",
+    "rel_type", "rel_props",
+    "target_id", "target_label", "target_props",
+)
+_NODE_ID = operator.itemgetter("id")
+
+# Traversal results kept per (entry ids, intent); oldest evicted first,
+# and none served once older than the TTL (seconds).
+_TRAVERSE_CACHE_SIZE = 512
+_TRAVERSE_CACHE_TTL = 300.0
+
 # UNWIND a Cypher path variable into individual edges.
 # Caller must alias the path as `path` before this clause.
 _PATH_UNWIND = """
@@ -63,6 +101,27 @@ _PATH_UNWIND = """
 """
 
 
+def subgraph_columns(subgraph: dict) -> dict[str, list]:
+    """
+    Struct-of-arrays view of a subgraph.
+
+    Returns parallel lists: node_ids, node_labels, node_names (one entry per
+    node) and rel_srcs, rel_tgts, rel_types (one entry per relationship).
+    Counting or filtering on a single field then scans one flat list
+    instead of picking the key out of every node/relationship dict.
+    """
+    nodes = subgraph.get("nodes", [])
+    rels  = subgraph.get("relationships", [])
+    return {
+        "node_ids":    list(map(_NODE_ID, nodes)),
+        "node_labels": [n.get("label", "Unknown") for n in nodes],
+        "node_names":  [n.get("name", "") for n in nodes],
+        "rel_srcs":    [r["source_id"] for r in rels],
+        "rel_tgts":    [r["target_id"] for r in rels],
+        "rel_types":   [r["type"] for r in rels],
+    }
+
+
 class SmartTraversalEngine:
     """
     Executes intent-driven graph traversal.
@@ -71,16 +130,58 @@ class SmartTraversalEngine:
     ----------
     connector  : Active GraphDBConnector.
     config_path: Path to the domain config JSON.
+    cache_size : Traversal results memoised per (entry ids, intent).
+                 0 disables the cache; call invalidate() after graph writes.
+    cache_ttl  : Seconds a memoised traversal is reused, so writes made
+                 outside this process show up within that window.
     """
 
-    def __init__(self, connector: GraphDBConnector, config: str | dict):
+    def __init__(
+        self,
+        connector: GraphDBConnector,
+        config: str | dict,
+        cache_size: int = _TRAVERSE_CACHE_SIZE,
+        cache_ttl: float = _TRAVERSE_CACHE_TTL,
+    ):
         self.connector = connector
-        self._config = _load_config(config)
+        self._cache_ttl = cache_ttl
+        self._cache_size = cache_size
+        # {(entry ids, intent): (expires_at, subgraph)}, in LRU order.
+        self._cache: OrderedDict[tuple[frozenset, str], tuple[float, dict]] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._config = load_config(config)
         self._intent_patterns: dict = self._config["intent_patterns"]
         self._general_limit: int = (
             self._config.get("general_traversal", {}).get("node_limit", 30)
         )
 
+        # Cypher is materialised once per intent: at query time only $ids
+        # (and $min_conn) vary, so Neo4j reuses one cached plan per intent.
+        builders = {
+            "targeted":       self._targeted,
+            "chained":        self._chained,
+            "variable_hop":   self._variable_hop,
+            "shortest_path":  self._shortest_path,
+            "shared_neighbor":self._shared_neighbor,
+        }
+        self._general_template = self._general()
+        self._templates: dict[str, tuple[str, str, int]] = {}
+        self._single_entry_templates: dict[str, tuple[str, int]] = {}
+        self._min_connections: dict[str, int] = {}
+        for intent, pattern in self._intent_patterns.items():
+            strategy = pattern.get("strategy", "targeted")
+            build = builders.get(strategy)
+            cypher, hop_depth = build(pattern) if build else self._general_template
+            self._templates[intent] = (strategy, cypher, hop_depth)
+            if strategy == "shortest_path":
+                # Single entry: just do a neighbourhood exploration
+                max_h = pattern.get("max_hops", 6)
+                self._single_entry_templates[intent] = self._variable_hop(
+                    {"min_hops": 1, "max_hops": max_h}
+                )
+            elif strategy == "shared_neighbor":
+                self._min_connections[intent] = pattern.get("min_connections", 2)
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
@@ -90,35 +191,120 @@ class SmartTraversalEngine:
         Traverse the graph from entry_nodes using the strategy defined by intent.
 
         Returns a subgraph dict with keys: nodes, relationships, strategy, hop_depth.
+        Results are memoised per (set of entry ids, intent); every call gets
+        its own copy of the nodes/relationships lists.
         """
         if not entry_nodes:
             return {"nodes": [], "relationships": [], "strategy": "none", "hop_depth": 0}
 
-        entry_ids = [n["id"] for n in entry_nodes]
-        pattern   = self._intent_patterns.get(intent)
-        strategy  = pattern.get("strategy", "targeted") if pattern else "general"
+        entry_ids = list(map(_NODE_ID, entry_nodes))
+        if self._cache_size <= 0 or self._cache_ttl <= 0:
+            return self._run_traversal(entry_nodes, entry_ids, intent)
+
+        key = (frozenset(entry_ids), intent)
+        now = time.monotonic()
+        subgraph = None
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] > now:
+                subgraph = entry[1]
+                self._cache.move_to_end(key)
+        if subgraph is None:
+            subgraph = self._run_traversal(entry_nodes, entry_ids, intent)
+            with self._cache_lock:
+                self._cache[key] = (time.monotonic() + self._cache_ttl, subgraph)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+        return self._copy_subgraph(subgraph)
+
+    def preflight(self) -> list[str]:
+        """
+        EXPLAIN every compiled template once, so Neo4j plans and caches them
+        before the first real query.
 
-        dispatch = {
-            "targeted":       self._targeted,
-            "chained":        self._chained,
-            "variable_hop":   self._variable_hop,
-            "shortest_path":  self._shortest_path,
-            "shared_neighbor":self._shared_neighbor,
+        Dummy parameters carry the same types as traverse() binds, since the
+        plan cache is keyed on them. Templates the planner rejects are logged
+        and returned by name rather than raised; connection errors propagate.
+        Nothing is executed.
+        """
+        dummy = {"ids": [""], "min_conn": 1, "pairs": [["", ""]]}
+        templates = {"general": self._general_template[0]}
+        for intent, (_, cypher, _) in self._templates.items():
+            templates[intent] = cypher
+        for intent, (cypher, _) in self._single_entry_templates.items():
+            templates[f"{intent} (single entry)"] = cypher
+
+        failed = []
+        for name, cypher in templates.items():
+            try:
+                self.connector.execute_read(f"EXPLAIN {cypher}", dummy)
+            except ClientError as e:
+                logger.warning("EXPLAIN failed for intent %r: %s", name, e)
+                failed.append(name)
+        return failed
+
+    def invalidate(self) -> None:
+        """Forget every memoised traversal (e.g. after writing to the graph)."""
+        with self._cache_lock:
+            self._cache.clear()
+
+    @staticmethod
+    def _copy_subgraph(subgraph: dict) -> dict:
+        # Fresh top-level dict and lists, so callers can filter/append freely
+        # without touching the cached copy; node/edge dicts are shared.
+        return {
+            **subgraph,
+            "nodes":         list(subgraph["nodes"]),
+            "relationships": list(subgraph["relationships"]),
         }
 
-        fn = dispatch.get(strategy, self._general)
-        rows, hop_depth = fn(entry_ids, pattern or {})
+    def _run_traversal(self, entry_nodes: list[dict], entry_ids: list[str], intent: str) -> dict:
+        template  = self._templates.get(intent)
+        if template:
+            strategy, cypher, hop_depth = template
+        else:
+            strategy = "general"
+            cypher, hop_depth = self._general_template
+
+        params: dict = {"ids": entry_ids}
+        if strategy == "shortest_path":
+            if len(entry_ids) < 2:
+                cypher, hop_depth = self._single_entry_templates[intent]
+            else:
+                # Each unordered pair once, in a stable (sorted) order
+                params = {"pairs": list(combinations(sorted(set(entry_ids)), 2))}
+        elif strategy == "shared_neighbor":
+            # min_connections defaults to 2 but will not exceed len(entry_ids)
+            params["min_conn"] = min(self._min_connections[intent], len(entry_ids))
+
+        rows = self.connector.execute_query(cypher, params)
 
         subgraph = self._build_subgraph(rows, entry_nodes)
         subgraph["strategy"]  = strategy
         subgraph["hop_depth"] = hop_depth
         return subgraph
 
+    def traverse_many(self, entry_nodes: list[dict], intents: list[str]) -> dict[str, dict]:
+        """
+        Run traverse() for several intents over the same entry nodes.
+
+        The traversals are independent round-trips, so they run on a thread
+        pool (the driver is thread-safe) and cost roughly the slowest one
+        rather than their sum. Returns {intent: subgraph}.
+        """
+        intents = list(dict.fromkeys(intents))
+        if len(intents) <= 1:
+            return {intent: self.traverse(entry_nodes, intent) for intent in intents}
+        with ThreadPoolExecutor(max_workers=len(intents)) as pool:
+            subgraphs = pool.map(lambda intent: self.traverse(entry_nodes, intent), intents)
+            return dict(zip(intents, subgraphs))
+
     # ------------------------------------------------------------------
     # Strategy: targeted  (1-hop, original behaviour)
     # ------------------------------------------------------------------
 
-    def _targeted(self, entry_ids: list[str], pattern: dict) -> tuple[list[dict], int]:
+    def _targeted(self, pattern: dict) -> tuple[str, int]:
         """Single named relationship, directional or symmetric."""
         src_label = pattern.get("source_label", "")
         rel_name  = pattern["relationship"]
@@ -138,14 +324,13 @@ class SmartTraversalEngine:
             where = "elementId(src) IN $ids"
             match = f"MATCH {src}-[r:{rel_name}]->{tgt}"
 
-        cypher = f"{match}\nWHERE {where}\n{_EDGE_RETURN}\nLIMIT 50"
-        return self.connector.execute_query(cypher, {"ids": entry_ids}), 1
+        return f"{match}\nWHERE {where}\n{_EDGE_RETURN}\nLIMIT 50", 1
 
     # ------------------------------------------------------------------
     # Strategy: chained  (fixed multi-hop sequence)
     # ------------------------------------------------------------------
 
-    def _chained(self, entry_ids: list[str], pattern: dict) -> tuple[list[dict], int]:
+    def _chained(self, pattern: dict) -> tuple[str, int]:
         """
         Follow a fixed sequence of relationships from the entry nodes.
 
@@ -177,15 +362,15 @@ class SmartTraversalEngine:
             WHERE elementId(n0) IN $ids
             WITH path LIMIT 100
             {_PATH_UNWIND}
-            {_EDGE_RETURN}
+            {_EDGE_RETURN_AGG}
         """
-        return self.connector.execute_query(cypher, {"ids": entry_ids}), n_hops
+        return cypher, n_hops
 
     # ------------------------------------------------------------------
     # Strategy: variable_hop  (free 1..N neighbourhood)
     # ------------------------------------------------------------------
 
-    def _variable_hop(self, entry_ids: list[str], pattern: dict) -> tuple[list[dict], int]:
+    def _variable_hop(self, pattern: dict) -> tuple[str, int]:
         """
         Explore up to max_hops hops in any direction, unrolling every
         intermediate edge so all nodes in the path appear in the subgraph.
@@ -203,86 +388,80 @@ class SmartTraversalEngine:
             WHERE elementId(source) IN $ids AND source <> target
             WITH path LIMIT 60
             {_PATH_UNWIND}
-            {_EDGE_RETURN}
+            {_EDGE_RETURN_AGG}
         """
-        return self.connector.execute_query(cypher, {"ids": entry_ids}), max_h
+        return cypher, max_h
 
     # ------------------------------------------------------------------
     # Strategy: shortest_path  (connect multiple entry nodes)
     # ------------------------------------------------------------------
 
-    def _shortest_path(self, entry_ids: list[str], pattern: dict) -> tuple[list[dict], int]:
+    def _shortest_path(self, pattern: dict) -> tuple[str, int]:
         """
         Find the shortest undirected path between every pair of entry nodes.
         Also finds paths from each entry node to any node named in the query
         context (handled by the caller, who includes all matched nodes in
         entry_ids).
 
-        Falls back to variable_hop when only one entry node is given.
+        The pairs are bound as $pairs by traverse() and UNWOUND server-side,
+        so each pair is two id lookups instead of an ids x ids cross product.
+
+        traverse() falls back to variable_hop when only one entry node is given.
         """
         max_h = pattern.get("max_hops", 6)
 
-        if len(entry_ids) < 2:
-            # Single entry: just do a neighbourhood exploration
-            return self._variable_hop(entry_ids, {"min_hops": 1, "max_hops": max_h})
-
         cypher = f"""
-            MATCH (a), (b)
-            WHERE elementId(a) IN $ids
-              AND elementId(b) IN $ids
-              AND elementId(a) < elementId(b)
+            UNWIND $pairs AS pair
+            MATCH (a) WHERE elementId(a) = pair[0]
+            MATCH (b) WHERE elementId(b) = pair[1]
             MATCH path = shortestPath((a)-[*..{max_h}]-(b))
             WITH path LIMIT 20
             {_PATH_UNWIND}
-            {_EDGE_RETURN}
+            {_EDGE_RETURN_AGG}
         """
-        rows = self.connector.execute_query(cypher, {"ids": entry_ids})
-        hop_depth = max(len(r.get("path_lens", [])) for r in rows) if rows else max_h
-        return rows, max_h
+        return cypher, max_h
 
     # ------------------------------------------------------------------
     # Strategy: shared_neighbor  (intersection of neighbourhoods)
     # ------------------------------------------------------------------
 
-    def _shared_neighbor(self, entry_ids: list[str], pattern: dict) -> tuple[list[dict], int]:
+    def _shared_neighbor(self, _pattern: dict) -> tuple[str, int]:
         """
         Find nodes that are direct neighbours of ALL (or most) entry nodes.
         Returns the edges connecting each entry node to those shared neighbours.
 
         Useful for queries like "what do aspirin and ibuprofen have in common?".
 
-        min_connections defaults to 2 but will not exceed len(entry_ids).
+        The entry->neighbour edges are collected during the single expansion
+        and unwound directly, rather than re-matched against the shared ids.
+        The threshold is bound as $min_conn by traverse().
         """
-        min_conn = min(pattern.get("min_connections", 2), len(entry_ids))
-
         cypher = """
             MATCH (entry)-[r]-(neighbor)
             WHERE elementId(entry) IN $ids
-            WITH neighbor, collect(DISTINCT elementId(entry)) AS connected_entries
+            WITH neighbor,
+                 collect(DISTINCT elementId(entry)) AS connected_entries,
+                 collect({src: entry, rel: r})      AS edges
             WHERE size(connected_entries) >= $min_conn
-            WITH collect(elementId(neighbor)) AS shared_ids
-            MATCH (src)-[r2]-(tgt)
-            WHERE elementId(src) IN $ids AND elementId(tgt) IN shared_ids
+            UNWIND edges AS e
+            WITH e.src AS src, e.rel AS r, neighbor AS tgt
             RETURN DISTINCT
                 elementId(src)  AS source_id,
                 labels(src)[0]  AS source_label,
                 properties(src) AS source_props,
-                type(r2)        AS rel_type,
-                properties(r2)  AS rel_props,
+                type(r)         AS rel_type,
+                properties(r)   AS rel_props,
                 elementId(tgt)  AS target_id,
                 labels(tgt)[0]  AS target_label,
                 properties(tgt) AS target_props
         """
-        return (
-            self.connector.execute_query(cypher, {"ids": entry_ids, "min_conn": min_conn}),
-            1,
-        )
+        return cypher, 1
 
     # ------------------------------------------------------------------
     # Strategy: general  (fallback 1-hop in any direction)
     # ------------------------------------------------------------------
 
-    def _general(self, entry_ids: list[str], _pattern: dict) -> tuple[list[dict], int]:
+    def _general(self) -> tuple[str, int]:
         """One-hop exploration following edge direction, no relationship filter."""
         # FIX: Directional -> to prevent reverse-edge nonsense
         cypher = f"""
@@ -291,7 +470,7 @@ class SmartTraversalEngine:
             {_EDGE_RETURN}
             LIMIT {self._general_limit}
         """
-        return self.connector.execute_query(cypher, {"ids": entry_ids}), 1
+        return cypher, 1
 
     # ------------------------------------------------------------------
     # Subgraph assembly  (shared by all strategies)
@@ -299,37 +478,73 @@ class SmartTraversalEngine:
 
     def _build_subgraph(self, rows: list[dict], entry_nodes: list[dict]) -> dict:
         """
-        Deduplicate and assemble nodes + relationships from flat result rows.
+        Deduplicate and assemble nodes + relationships from flat result rows
+        (or the single aggregated row of the path strategies).
         Entry nodes are always present even when traversal returns nothing.
+        Nodes are unique by id, relationships by (source, target, type).
         """
-        seen_ids: set[str] = set()
-        nodes:    list[dict] = []
-        rels:     list[dict] = []
+        seen_ids:  set[str] = set()
+        seen_rels: set[tuple[str, str, str]] = set()
+        nodes:     list[dict] = []
+        rels:      list[dict] = []
 
         for en in entry_nodes:
             if en["id"] not in seen_ids:
                 seen_ids.add(en["id"])
                 nodes.append(en)
 
-        for row in rows:
-            for side in ("source", "target"):
-                nid = row.get(f"{side}_id")
-                if nid and nid not in seen_ids:
-                    seen_ids.add(nid)
-                    props = row.get(f"{side}_props") or {}
-                    nodes.append({
-                        "id":         nid,
-                        "label":      row.get(f"{side}_label") or "Unknown",
-                        "name":       props.get("name", ""),
-                        "properties": props,
+        if len(rows) == 1 and "edges" in rows[0]:
+            records = self._aggregated_records(rows[0])
+        else:
+            records = map(_ROW_FIELDS, rows)
+
+        row_node = self._row_node
+        for (src, src_label, src_props, rel_type, rel_props,
+             tgt, tgt_label, tgt_props) in records:
+            if src and src not in seen_ids:
+                seen_ids.add(src)
+                nodes.append(row_node(src, src_label, src_props))
+            if tgt and tgt not in seen_ids:
+                seen_ids.add(tgt)
+                nodes.append(row_node(tgt, tgt_label, tgt_props))
+
+            if src and tgt:
+                rel_type = sys.intern(rel_type or "RELATED_TO")
+                key = (src, tgt, rel_type)
+                if key not in seen_rels:
+                    seen_rels.add(key)
+                    rels.append({
+                        "source_id": src,
+                        "target_id": tgt,
+                        "type":      rel_type,
+                        "properties":rel_props or {},
                     })
 
-            if row.get("source_id") and row.get("target_id"):
-                rels.append({
-                    "source_id": row["source_id"],
-                    "target_id": row["target_id"],
-                    "type":      row.get("rel_type", "RELATED_TO"),
-                    "properties":row.get("rel_props") or {},
-                })
-
         return {"nodes": nodes, "relationships": rels}
+
+    @staticmethod
+    def _aggregated_records(row: dict):
+        """Per-edge tuples (as _ROW_FIELDS yields) from an _EDGE_RETURN_AGG row."""
+        by_id = {n["id"]: n for n in row.get("nodes") or []}
+        empty: dict = {}
+        for edge in row["edges"] or []:
+            src = by_id.get(edge["source_id"], empty)
+            tgt = by_id.get(edge["target_id"], empty)
+            yield (
+                edge["source_id"], src.get("label"), src.get("properties"),
+                edge["rel_type"],  edge["rel_props"],
+                edge["target_id"], tgt.get("label"), tgt.get("properties"),
+            )
+
+    @staticmethod
+    def _row_node(nid: str, label: str | None, props: dict | None) -> dict:
+        # Ids, labels and names recur across rows and feed set/dict lookups
+        # downstream; interning makes those compare by pointer.
+        props = props or {}
+        name = props.get("name", "")
+        return {
+            "id":         sys.intern(nid) if isinstance(nid, str) else nid,
+            "label":      sys.intern(label or "Unknown"),
+            "name":       sys.intern(name) if isinstance(name, str) else name,
+            "properties": props,
+        }